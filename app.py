@@ -1,5 +1,10 @@
 import streamlit as st
 
+from utils.warmup import start_warmup
+
+# Fill the shared price/model/data caches in the background so the first visitor does not pay for them.
+warmup = start_warmup()
+
 about_page = st.Page(
     "pages/about_me.py",
     title="About Me",
@@ -12,6 +17,18 @@ project_1_page = st.Page(
     icon="📊",
 )
 
+screener_page = st.Page(
+    "pages/screener.py",
+    title="Index Screener",
+    icon="🔎",
+)
+
+intraday_page = st.Page(
+    "pages/intraday.py",
+    title="Intraday Charts",
+    icon="⏱️",
+)
+
 # project_2_page = st.Page(
 #     "pages/assistant.py",
 #     title="Chatbot Assisstant",
@@ -34,10 +51,13 @@ project_3_page = st.Page(
 pg = st.navigation(
     {
         # "Info": [about_page],
-        "Projects": [project_1_page, project_3_page],
+        "Projects": [project_1_page, screener_page, intraday_page, project_3_page],
     }
 )
 
+if not warmup.ready:
+    st.sidebar.caption("⏳ Warming up data caches...")
+
 st.sidebar.markdown("Made with ❤️ by [Kevin](https://www.linkedin.com/in/kevin-van-wallendael/)")
 
 pg.run()
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""Reference checks for the vectorized computation paths.
+
+Each check runs a fast implementation on seeded synthetic data next to a plain
+reference (a day-by-day loop or the pandas equivalent) and reports the largest
+difference. benchmarks.run runs them before timing anything, so an optimization
+that changes results fails the suite even when it is faster:
+
+    python -m benchmarks.checks
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import StubProvider, make_price_panel
+from utils import market_data
+from utils.backtest import Backtester
+from utils.intraday import RESOLUTIONS, IntradayStore
+from utils.portfolio import calculate_moving_average, calculate_rebalanced_portfolio_value, calculate_rsi, create_buy_sell_signals
+from utils.price_matrix import PriceMatrix
+from utils.screener import screen_signals
+
+# Largest relative difference accepted between an implementation and its reference.
+TOLERANCE = 1e-9
+
+
+def max_relative_error(actual, expected):
+    actual = np.asarray(actual, dtype=float)
+    expected = np.asarray(expected, dtype=float)
+    if actual.shape != expected.shape:
+        return np.inf
+    if not np.array_equal(np.isnan(actual), np.isnan(expected)):
+        return np.inf
+    valid = ~np.isnan(expected)
+    if not valid.any():
+        return 0.0
+    return float(np.max(np.abs(actual[valid] - expected[valid]) / np.maximum(np.abs(expected[valid]), 1.0)))
+
+
+# --- Rebalancing ---
+
+def reference_rebalanced_value(stock_data, weights, initial_investment, frequency, threshold, transaction_cost):
+    """Day-by-day rebalancing: hold shares, reset them to the target weights at the close when due."""
+    prices = stock_data.to_numpy(dtype=float)
+    periods = stock_data.index.to_period({"monthly": "M", "quarterly": "Q", "annually": "Y"}.get(frequency, "D"))
+    shares = weights * initial_investment / prices[0]
+    values = [initial_investment]
+    for day in range(1, len(prices)):
+        holdings = shares * prices[day]
+        value = holdings.sum()
+        drifted = holdings / value
+        if frequency == "threshold":
+            due = np.abs(drifted - weights).max() > threshold
+        else:
+            due = frequency != "none" and periods[day] != periods[day - 1]
+        if due:
+            value *= 1 - transaction_cost * np.abs(drifted - weights).sum()
+            shares = weights * value / prices[day]
+        values.append(value)
+    return np.array(values)
+
+def check_rebalancing(seed):
+    stock_data = make_price_panel(8, 3, seed=seed)
+    price_matrix = PriceMatrix.from_frames(stock_data)
+    weights = np.random.default_rng(seed).dirichlet(np.ones(stock_data.shape[1]))
+    allocations = dict(zip(stock_data.columns, weights))
+
+    errors = {}
+    for frequency in ["none", "monthly", "quarterly", "annually", "threshold"]:
+        for transaction_cost in [0.0, 0.002]:
+            actual = calculate_rebalanced_portfolio_value(
+                price_matrix, allocations, 100000, frequency=frequency, threshold=0.05, transaction_cost=transaction_cost
+            )[0]
+            expected = reference_rebalanced_value(stock_data, weights, 100000, frequency, 0.05, transaction_cost)
+            errors[f"calculate_rebalanced_portfolio_value ({frequency}, cost {transaction_cost:g})"] = \
+                max_relative_error(actual, expected)
+    return errors
+
+
+# --- Screener ---
+
+def check_screener(seed):
+    """screen_signals against the last row of create_buy_sell_signals for every ticker."""
+    stock_data = make_price_panel(30, 2, seed=seed)
+    results = screen_signals(PriceMatrix.from_frames(stock_data)).set_index("Ticker").loc[stock_data.columns]
+
+    expected = {"MA50": [], "MA200": [], "RSI": [], "Signal": [], "RSI Signal": []}
+    for ticker in stock_data.columns:
+        signals, ma50, ma200, rsi = create_buy_sell_signals(stock_data[ticker])
+        for column, value in [("MA50", ma50.iloc[-1]), ("MA200", ma200.iloc[-1]), ("RSI", rsi.iloc[-1]),
+                              ("Signal", signals["Signal"].iloc[-1]), ("RSI Signal", signals["RSI Signal"].iloc[-1])]:
+            expected[column].append(value)
+
+    errors = {f"screen_signals {column}": max_relative_error(results[column], expected[column])
+              for column in ["MA50", "MA200", "RSI"]}
+    for column in ["Signal", "RSI Signal"]:
+        errors[f"screen_signals {column}"] = 0.0 if list(results[column]) == expected[column] else np.inf
+    return errors
+
+
+# --- Backtester ---
+
+def check_backtester(seed):
+    """Backtester's prefix-sum indicators and positions against the pandas rolling versions."""
+    stock_data = make_price_panel(12, 3, seed=seed)
+    # Tickers listed partway through, so windows over missing prices are covered too.
+    for i, column in enumerate(stock_data.columns[:4]):
+        stock_data.iloc[:40 * (i + 1), stock_data.columns.get_loc(column)] = np.nan
+    backtester = Backtester(PriceMatrix.from_frames(stock_data), transaction_cost=0.001)
+
+    errors = {}
+    for window in [20, 50, 200]:
+        errors[f"Backtester.moving_average({window})"] = max_relative_error(
+            backtester.moving_average(window), calculate_moving_average(stock_data, window))
+    for period in [7, 14]:
+        errors[f"Backtester.rsi({period})"] = max_relative_error(backtester.rsi(period), calculate_rsi(stock_data, period))
+
+    ma_positions = calculate_moving_average(stock_data, 50) > calculate_moving_average(stock_data, 200)
+    errors["Backtester.ma_positions"] = max_relative_error(backtester.ma_positions(50, 200), ma_positions)
+    rsi = calculate_rsi(stock_data, 14)
+    rsi_positions = (rsi < 30).astype(float).where((rsi < 30) | (rsi > 70)).ffill().fillna(0)
+    errors["Backtester.rsi_positions"] = max_relative_error(backtester.rsi_positions(14, 30, 70), rsi_positions)
+
+    # Positions taken at the close earn the next day's return, less costs on every change.
+    positions = pd.DataFrame(backtester.ma_positions(50, 200), index=stock_data.index, columns=stock_data.columns)
+    daily = positions.shift(1) * stock_data.pct_change(fill_method=None).fillna(0) \
+        - 0.001 * positions.diff().fillna(positions).abs().shift(1)
+    expected_equity = 100000 * (1 + daily.fillna(0)).cumprod()
+    equity = backtester.run(positions.to_numpy())[0]
+    errors["Backtester.run equity"] = max_relative_error(equity, expected_equity)
+    return errors
+
+
+# --- Intraday Resampling ---
+
+def check_intraday_resample(seed):
+    """IntradayStore.resample against pandas resample of the same 1-minute bars."""
+    tickers = ["AAPL", "MSFT", "NVDA"]
+    start_date, end_date = "2024-03-04", "2024-03-16"
+    provider = StubProvider(seed=seed)
+    original = market_data.yf.download
+    market_data.yf.download = provider.download
+    try:
+        raw = market_data.fetch_intraday_data(tickers, start_date, end_date, "1m")
+        store = IntradayStore("1m", fetcher=market_data.fetch_intraday_data)
+        resampled = {resolution: store.resample(tickers, start_date, end_date, resolution) for resolution in RESOLUTIONS}
+    finally:
+        market_data.yf.download = original
+
+    # The store keeps prices as float32 and volume as uint32, so the reference starts from the same values.
+    raw = raw.astype({column: np.uint32 if column[0] == "Volume" else np.float32 for column in raw.columns})
+    aggregations = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    errors = {}
+    for resolution, bars in resampled.items():
+        rule = "1D" if resolution == "1D" else f"{RESOLUTIONS[resolution]}min"
+        expected = pd.concat({
+            ticker: raw.xs(ticker, axis=1, level=1).resample(rule).agg(aggregations).dropna(subset=["Close"])
+            for ticker in tickers
+        }, axis=1).swaplevel(axis=1)[bars.columns]
+        errors[f"IntradayStore.resample ({resolution})"] = (
+            max_relative_error(bars, expected) if bars.index.equals(expected.index) else np.inf
+        )
+    return errors
+
+
+CHECKS = [check_rebalancing, check_screener, check_backtester, check_intraday_resample]
+
+
+def run_checks(seed=42, tolerance=TOLERANCE):
+    """Runs every check, prints its error and returns the names of those above `tolerance`."""
+    failures = []
+    for check in CHECKS:
+        for name, error in check(seed).items():
+            status = "ok" if error <= tolerance else "FAILED"
+            print(f"check {name:66} {error:10.1e} {status}")
+            if error > tolerance:
+                failures.append(name)
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if run_checks() else 0)
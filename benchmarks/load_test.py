@@ -0,0 +1,376 @@
+"""Multi-session load test of the Streamlit pages.
+
+Simulates concurrent visitors with Streamlit's AppTest: every session opens
+app.py and walks through interaction scripts on the pages (analyze a portfolio,
+toggle housing amenities, chat with the assistant, send the contact form).
+yfinance, OpenAI and the contact webhook are replaced by local stand-ins, so
+runs are repeatable and offline:
+
+    python -m benchmarks.load_test --sessions 20
+    python -m benchmarks.load_test --sessions 50 --scenarios portfolio housing --max-p95 2000
+
+Reports p50/p95 rerun latency per page, reruns per second across all sessions,
+and the memory a session adds to its process.
+
+AppTest swaps process-global state (the runtime, secrets) on every run, so two
+AppTests cannot run in one process at the same time. Each visitor therefore runs
+in its own process: it first walks the scenarios once to warm that process's
+caches, then all visitors start together and their reruns overlap.
+
+These numbers are per-process upper bounds, not the capacity of one container.
+A Streamlit server runs every session in one process, under one GIL and with
+shared st.cache_data/st.cache_resource entries. Here each visitor has its own
+interpreter, caches and warm-up thread, so latency and throughput look better
+than one server would manage, and the memory per session leaves out the
+shared caches.
+"""
+import argparse
+import json
+import os
+import multiprocessing
+import queue
+import resource
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks.synthetic import StubProvider
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+LOAD_RESULTS_PATH = os.path.join(os.path.dirname(__file__), "load_results.json")
+
+
+# --- Stand-ins ---
+
+class StubOpenAI:
+    """Stand-in for `openai.OpenAI` that answers chat completions after `latency` seconds."""
+
+    latency = 0.0
+
+    def __init__(self, api_key=None, **kwargs):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages, **kwargs):
+        time.sleep(self.latency)
+        prompt = messages[-1]["content"]
+        message = SimpleNamespace(content=f"Stub reply to: {prompt[:80]}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class WebhookServer:
+    """Local HTTP server standing in for the contact webhook; counts the POSTs it receives."""
+
+    def __init__(self, latency=0.0):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                time.sleep(server.latency)
+                with server._lock:
+                    server.received += 1
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.latency = latency
+        self.received = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="webhook-stub", daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}/hook"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+
+    def wait_for(self, count, timeout):
+        deadline = time.monotonic() + timeout
+        while self.received < count and time.monotonic() < deadline:
+            time.sleep(0.1)
+        return self.received
+
+
+def install_stand_ins(seed, openai_latency, webhook_url, outbox_path):
+    """Points yfinance, OpenAI and the contact form at the local stand-ins.
+
+    Must run before forms.contact is imported, since it reads its settings at import.
+    """
+    import openai
+    import yfinance
+
+    yfinance.download = StubProvider(seed=seed).download
+    StubOpenAI.latency = openai_latency
+    openai.OpenAI = StubOpenAI
+    os.environ["CONTACT_WEBHOOK_URL"] = webhook_url
+    os.environ["CONTACT_OUTBOX_PATH"] = outbox_path
+
+
+# --- Interaction Scripts ---
+
+def _contact_page():
+    from forms.contact import contact_form
+
+    contact_form()
+
+def portfolio_scenario(session, step):
+    at = session.app
+    step("open", lambda: at.switch_page("pages/portfolio_analysis.py").run())
+    step("analyze", lambda: next(b for b in at.button if b.label == "Analyze Portfolio").click().run())
+    at.slider(key="AAPL").set_value(60.0)
+    step("change weights", lambda: at.slider(key="MSFT").set_value(40.0).run())
+    step("rebalance quarterly", lambda: at.selectbox[0].select("Quarterly").run())
+
+def housing_scenario(session, step):
+    at = session.app
+    step("open", lambda: at.switch_page("pages/housing_project.py").run())
+    for label in ["Balcony", "Terrace", "Garage/Parking"]:
+        step("toggle amenity", lambda label=label: next(c for c in at.checkbox if c.label == label).check().run())
+    step("estimate", lambda: next(b for b in at.button if b.label == "Estimate Price").click().run())
+
+def assistant_scenario(session, step):
+    at = session.app
+    at.secrets["openai"] = {"api_key": "stub"}
+    step("open", lambda: at.switch_page("pages/assistant.py").run())
+    for prompt in ["What projects has Kevin built?", "Which technologies does he use?"]:
+        step("chat", lambda prompt=prompt: at.chat_input[0].set_value(prompt).run())
+
+def screener_scenario(session, step):
+    at = session.app
+    step("open", lambda: at.switch_page("pages/screener.py").run())
+    at.selectbox[0].select("Predefined stocks")
+    step("screen", lambda: next(b for b in at.button if b.label == "Run Screener").click().run())
+
+def intraday_scenario(session, step):
+    at = session.app
+    step("open", lambda: at.switch_page("pages/intraday.py").run())
+    step("load bars", lambda: next(b for b in at.button if b.label == "Load Intraday Data").click().run())
+
+def contact_scenario(session, step):
+    from streamlit.testing.v1 import AppTest
+
+    session.contact = at = AppTest.from_function(_contact_page, default_timeout=session.timeout)
+    step("open", lambda: at.run())
+    at.text_input[0].input(f"Load Test {session.id}")
+    at.text_input[1].input(f"visitor{session.id}@example.com")
+    at.text_area[0].input("Hello from the load test.")
+    step("submit", lambda: at.button[0].click().run())
+    session.messages_sent += 1
+
+SCENARIOS = {
+    "portfolio": ("portfolio_analysis", portfolio_scenario),
+    "housing": ("housing_project", housing_scenario),
+    "assistant": ("assistant", assistant_scenario),
+    "screener": ("screener", screener_scenario),
+    "intraday": ("intraday", intraday_scenario),
+    "contact": ("contact", contact_scenario),
+}
+
+
+# --- Sessions ---
+
+class Session:
+    """One simulated visitor: an AppTest of app.py plus the timings of every rerun."""
+
+    def __init__(self, session_id, timeout):
+        self.id = session_id
+        self.timeout = timeout
+        self.app = None
+        self.contact = None
+        self.messages_sent = 0
+        self.timings = []  # (page, action, seconds, failed)
+        self.errors = []
+        # Set by _visitor: wall-clock span of the measured run and the memory it added.
+        self.started = self.finished = self.rss_bytes = None
+
+    def run(self, scenarios):
+        from streamlit.testing.v1 import AppTest
+
+        self.app = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        self._time("app", "start", lambda: self.app.run(), self.app)
+        for name in scenarios:
+            page, scenario = SCENARIOS[name]
+            app = self.app
+
+            def step(action, rerun, page=page):
+                self._time(page, action, rerun, self.contact if page == "contact" else app)
+
+            try:
+                scenario(self, step)
+            except Exception as e:
+                self.errors.append(f"{name}: {e!r}")
+                print(f"Session {self.id}: {name} scenario failed: {e!r}")
+        return self
+
+    def _time(self, page, action, rerun, app):
+        started = time.perf_counter()
+        rerun()
+        seconds = time.perf_counter() - started
+        failed = app is not None and len(app.exception) > 0
+        self.timings.append((page, action, seconds, failed))
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # ru_maxrss is the peak, in KiB on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def _wait_for_outbox(timeout):
+    # The outbox worker is a daemon thread, so let it drain before the process exits.
+    from forms.contact import get_outbox
+
+    deadline = time.monotonic() + timeout
+    while get_outbox().metrics()["queue_depth"] and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+def _visitor(session_id, args, webhook_url, outbox_dir, start_barrier, results):
+    """Runs one visitor in its own process and puts its Session on `results`."""
+    sys.path.insert(0, ROOT)
+    outbox_path = os.path.join(outbox_dir, f"outbox-{session_id}.sqlite3")
+    install_stand_ins(args.seed, args.openai_latency, webhook_url, outbox_path)
+    session = Session(session_id, args.timeout)
+    try:
+        # Imports, process-wide caches and the warm-up thread are paid for before
+        # the clock starts, as they would be on a server that has been up a while.
+        warmup = Session("warmup", args.timeout).run(args.scenarios)
+        baseline_rss = _rss_bytes()
+        start_barrier.wait()
+        session.started = time.time()
+        session.run(args.scenarios)
+        session.finished = time.time()
+        session.rss_bytes = _rss_bytes() - baseline_rss
+        session.messages_sent += warmup.messages_sent
+        if session.messages_sent:
+            _wait_for_outbox(timeout=30)
+    except Exception as e:
+        session.errors.append(f"visitor process: {e!r}")
+    # Only plain values go back: AppTest rebinds __main__ to the app script, so
+    # Session objects (defined in __main__ under `python -m`) no longer pickle.
+    results.put({name: value for name, value in vars(session).items() if name not in ("app", "contact")})
+
+def run_sessions(args, webhook_url, outbox_dir):
+    """Starts one process per visitor, releases them together and returns their session results."""
+    start_barrier = multiprocessing.Barrier(args.sessions)
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_visitor, args=(i, args, webhook_url, outbox_dir, start_barrier, results))
+        for i in range(args.sessions)
+    ]
+    for process in processes:
+        process.start()
+
+    sessions = []
+    for _ in processes:
+        try:
+            sessions.append(SimpleNamespace(**results.get(timeout=args.timeout * 20)))
+        except queue.Empty:
+            break
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    if len(sessions) < args.sessions:
+        raise RuntimeError(f"Only {len(sessions)} of {args.sessions} visitor processes reported back.")
+    return sorted(sessions, key=lambda session: session.id)
+
+def summarize(sessions, wall_time):
+    """Returns per-page and per-action latency stats from all sessions' timings."""
+    rows = [timing for session in sessions for timing in session.timings]
+    pages, actions = {}, {}
+    for page, action, *sample in rows:
+        pages.setdefault(page, []).append(sample)
+        actions.setdefault(f"{page}: {action}", []).append(sample)
+
+    def stats(samples):
+        latency, failed = (np.array(column) for column in zip(*samples))
+        return {
+            "reruns": len(samples),
+            "failed": int(failed.sum()),
+            "p50_ms": float(np.percentile(latency, 50) * 1000),
+            "p95_ms": float(np.percentile(latency, 95) * 1000),
+            "max_ms": float(latency.max() * 1000),
+        }
+
+    return {
+        "pages": {page: stats(samples) for page, samples in pages.items()},
+        "actions": {action: stats(samples) for action, samples in actions.items()},
+        "reruns": len(rows),
+        "throughput_per_s": len(rows) / wall_time,
+        "script_errors": [error for session in sessions for error in session.errors],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="Simulated concurrent visitors.")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=["portfolio", "housing", "assistant", "contact"])
+    parser.add_argument("--openai-latency", type=float, default=0.0, help="Seconds the OpenAI stand-in takes per reply.")
+    parser.add_argument("--webhook-latency", type=float, default=0.0, help="Seconds the webhook stand-in takes per POST.")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds allowed per rerun.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-p95", type=float, default=None, help="Fail if any page's p95 rerun latency exceeds this many ms.")
+    parser.add_argument("--output", default=LOAD_RESULTS_PATH)
+    args = parser.parse_args(argv)
+
+    webhook = WebhookServer(args.webhook_latency).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Running {args.sessions} concurrent sessions, one process each: {', '.join(args.scenarios)}")
+        print("Results are per-process upper bounds, not single-container capacity (see the module docstring).")
+        sessions = run_sessions(args, webhook.url, tmp)
+        messages_sent = sum(session.messages_sent for session in sessions)
+        delivered = webhook.wait_for(messages_sent, timeout=30) if messages_sent else 0
+    webhook.stop()
+
+    measured = [session for session in sessions if session.finished is not None]
+    wall_time = max(session.finished for session in measured) - min(session.started for session in measured) if measured else 0.0
+    summary = summarize(sessions, wall_time or 1e-9)
+    summary.update({
+        "sessions": args.sessions,
+        "isolation": "one process per session; per-process upper bounds, not single-container capacity",
+        "scenarios": args.scenarios,
+        "wall_time_s": wall_time,
+        "memory_per_session_mb": float(np.mean([session.rss_bytes for session in measured]) / 2**20) if measured else None,
+        "webhook_messages": {"sent": messages_sent, "delivered": delivered},
+    })
+
+    print(f"\n{'page':24} {'reruns':>7} {'failed':>7} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for page, stats in summary["pages"].items():
+        print(f"{page:24} {stats['reruns']:7} {stats['failed']:7} {stats['p50_ms']:10.1f} {stats['p95_ms']:10.1f} "
+              f"{stats['max_ms']:10.1f}")
+    print(f"\n{summary['reruns']} reruns in {wall_time:.1f}s ({summary['throughput_per_s']:.1f} reruns/s)")
+    if summary["memory_per_session_mb"] is not None:
+        print(f"Memory per session: {summary['memory_per_session_mb']:.1f} MB")
+    if messages_sent:
+        print(f"Contact messages delivered to the webhook: {delivered}/{messages_sent}")
+
+    with open(args.output, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    slow = [page for page, stats in summary["pages"].items() if args.max_p95 and stats["p95_ms"] > args.max_p95]
+    failed = summary["script_errors"] or any(stats["failed"] for stats in summary["pages"].values())
+    if slow:
+        print(f"p95 above {args.max_p95:g} ms: {', '.join(slow)}")
+    return 1 if slow or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Micro-benchmarks for the portfolio and housing computation paths.
+
+Run from the repository root:
+
+    python -m benchmarks.run                       # time and compare against the baseline
+    python -m benchmarks.run --save-baseline       # record a new baseline
+    python -m benchmarks.run --tickers 10 100 --years 1 10 --threshold 0.25
+
+The reference checks in benchmarks.checks run first; if any vectorized path no
+longer matches its reference, the script exits with status 1 before timing.
+
+Timings are written to --output as JSON. Any case whose median is slower than the
+stored baseline by more than --threshold makes the script exit with status 1, as
+does a missing baseline unless --save-baseline is given.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.checks import run_checks
+from benchmarks.synthetic import make_price_panel, make_housing_inputs, make_otodom_scrape, fit_housing_pipeline, StubProvider
+from utils import market_data
+from utils.housing import predict_price
+from utils.otodom import parse_listings
+from utils.price_matrix import PriceMatrix
+from utils.portfolio import (
+    calculate_portfolio_value,
+    calculate_rebalanced_portfolio_value,
+    calculate_returns,
+    calculate_risk_return_metrics,
+    create_buy_sell_signals,
+    create_excel_report,
+    create_pdf_report,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), "results.json")
+
+
+# --- Timing ---
+
+def time_case(func, repeat, number=1):
+    """Returns per-call timings (seconds) of `func` over `repeat` rounds of `number` calls."""
+    func()  # warm-up: imports, caches, first-touch allocations
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+    return timings
+
+
+# --- Cases ---
+
+def portfolio_cases(n_tickers, n_years, seed):
+    stock_data = make_price_panel(n_tickers, n_years, seed=seed)
+    benchmark_data = make_price_panel(1, n_years, seed=seed + 1).iloc[:, 0]
+    price_matrix = PriceMatrix.from_frames(stock_data, benchmark_data)
+    allocations = dict.fromkeys(stock_data.columns, 1 / n_tickers)
+    portfolio_value = calculate_portfolio_value(price_matrix, allocations, 100000)
+    portfolio_returns = calculate_returns(portfolio_value)
+
+    df_comparison = pd.DataFrame({
+        "Portfolio": portfolio_value / portfolio_value.iloc[0] * 100,
+        "S&P 500": benchmark_data / benchmark_data.iloc[0] * 100,
+    })
+    allocations_df = pd.DataFrame({"Stock": allocations.keys(), "Weight": allocations.values()})
+
+    provider = StubProvider(seed=seed)
+    tickers = list(stock_data.columns)
+    start_date = stock_data.index[0].strftime('%Y-%m-%d')
+    end_date = stock_data.index[-1].strftime('%Y-%m-%d')
+
+    def fetch():
+        original = market_data.yf.download
+        market_data.yf.download = provider.download
+        try:
+            return market_data.fetch_stock_data(tickers, start_date, end_date)
+        finally:
+            market_data.yf.download = original
+
+    def buy_sell_signals():
+        for ticker in tickers:
+            create_buy_sell_signals(price_matrix.series(ticker))
+
+    return {
+        "fetch_stock_data (stub)": fetch,
+        "PriceMatrix.from_frames": lambda: PriceMatrix.from_frames(stock_data, benchmark_data),
+        "PriceMatrix.from_frames (float32)": lambda: PriceMatrix.from_frames(stock_data, benchmark_data, dtype=np.float32),
+        "calculate_portfolio_value": lambda: calculate_portfolio_value(price_matrix, allocations, 100000),
+        "calculate_rebalanced_portfolio_value (monthly)": lambda: calculate_rebalanced_portfolio_value(
+            price_matrix, allocations, 100000, frequency="monthly", transaction_cost=0.001),
+        "calculate_rebalanced_portfolio_value (threshold)": lambda: calculate_rebalanced_portfolio_value(
+            price_matrix, allocations, 100000, frequency="threshold", threshold=0.05),
+        "calculate_risk_return_metrics": lambda: calculate_risk_return_metrics(portfolio_returns, price_matrix.benchmark_returns),
+        "create_buy_sell_signals (all tickers)": buy_sell_signals,
+        "create_excel_report": lambda: create_excel_report(df_comparison, allocations_df),
+        "create_pdf_report": lambda: create_pdf_report(df_comparison, allocations_df),
+    }
+
+
+def housing_cases(rows, seed):
+    # A pipeline fitted here rather than the pickle, which only loads with the
+    # scikit-learn/XGBoost versions it was saved with, so these cases always run.
+    model = fit_housing_pipeline(seed=seed)
+
+    def predict(inputs):
+        return lambda: predict_price(model, inputs)
+
+    return {f"predict_price ({n} rows)": predict(make_housing_inputs(n, seed=seed)) for n in rows}
+
+
+def otodom_cases(rows, seed):
+    def parse(scrape):
+        return lambda: parse_listings(scrape, "2024-01-01")
+
+    return {f"parse_listings ({n} rows)": parse(make_otodom_scrape(n, seed=seed)) for n in rows}
+
+
+# --- Baseline Comparison ---
+
+def compare(results, baseline, threshold):
+    """Returns (name, baseline median, current median, change) for every case that regressed."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["median"]
+        after = result["median"]
+        change = after / before - 1
+        if change > threshold:
+            regressions.append((name, before, after, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[10, 100], help="Panel widths to benchmark.")
+    parser.add_argument("--years", type=float, nargs="+", default=[1, 5], help="Panel lengths in years.")
+    parser.add_argument("--housing-rows", type=int, nargs="+", default=[1, 1000], help="Batch sizes for predict_price.")
+    parser.add_argument("--scrape-rows", type=int, nargs="+", default=[1000, 100000], help="Raw Otodom scrape sizes for parse_listings.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per case.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown vs. baseline (0.2 = 20%%).")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline as well.")
+    args = parser.parse_args(argv)
+
+    failures = run_checks(args.seed)
+    if failures:
+        print(f"Results differ from the reference for: {', '.join(failures)}")
+        return 1
+
+    cases = {}
+    for n_tickers in args.tickers:
+        for n_years in args.years:
+            for name, func in portfolio_cases(n_tickers, n_years, args.seed).items():
+                cases[f"{name} [{n_tickers} tickers x {n_years:g}y]"] = func
+    cases.update(housing_cases(args.housing_rows, args.seed))
+    cases.update(otodom_cases(args.scrape_rows, args.seed))
+
+    results = {}
+    for name, func in cases.items():
+        timings = time_case(func, args.repeat)
+        results[name] = {"median": statistics.median(timings), "min": min(timings), "repeat": args.repeat}
+        print(f"{name:70} {results[name]['median'] * 1000:10.2f} ms")
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 1
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    unchecked = [name for name in results if name not in baseline]
+    if unchecked:
+        print(f"Not in the baseline, so not checked: {', '.join(unchecked)}")
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after, change in regressions:
+        print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms (+{change:.0%})")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} of the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
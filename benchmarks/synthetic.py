@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+
+# --- Synthetic Market Data ---
+
+def make_price_panel(n_tickers, n_years, seed=0, start_date="2015-01-01"):
+    """Returns a seeded geometric-Brownian-motion Close panel (business days x tickers)."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start_date, periods=int(n_years * 252))
+    drift = rng.normal(0.0003, 0.0002, n_tickers)
+    volatility = rng.uniform(0.01, 0.03, n_tickers)
+    log_returns = rng.standard_normal((len(index), n_tickers)) * volatility + drift
+    prices = rng.uniform(20, 500, n_tickers) * np.exp(np.cumsum(log_returns, axis=0))
+    columns = [f"T{i:04d}" for i in range(n_tickers)]
+    return pd.DataFrame(prices, index=index, columns=columns)
+
+
+class StubProvider:
+    """Stand-in for `yfinance.download` that serves slices of seeded synthetic prices.
+
+    Every requested symbol gets its own deterministic series, so results do not
+    depend on which other tickers are requested alongside it.
+    """
+
+    def __init__(self, seed=0, start_date="2010-01-01", end_date="2030-12-31"):
+        self.seed = seed
+        self.index = pd.bdate_range(start_date, end_date)
+        self._series = {}
+        self.calls = 0
+
+    def _close(self, ticker):
+        if ticker not in self._series:
+            rng = np.random.default_rng([self.seed, *ticker.encode()])
+            log_returns = rng.normal(0.0003, rng.uniform(0.01, 0.03), len(self.index))
+            self._series[ticker] = rng.uniform(20, 500) * np.exp(np.cumsum(log_returns))
+        return self._series[ticker]
+
+    def _intraday(self, symbols, start, end, interval):
+        # Regular-session bars (09:30-16:00 exchange time) drifting from each day's close.
+        minutes = int(interval.rstrip("m"))
+        days = self.index[(self.index >= pd.Timestamp(start)) & (self.index < pd.Timestamp(end))]
+        offsets = pd.to_timedelta(np.arange(570, 960, minutes), unit="min")
+        index = (days.values[:, None] + offsets.values[None, :]).ravel()
+        index = pd.DatetimeIndex(index, name="Datetime").tz_localize("America/New_York")
+        fields = {field: {} for field in ["Open", "High", "Low", "Close", "Volume"]}
+        shape = (len(days), len(offsets))
+        for symbol in sorted(symbols):
+            # Seeded per (symbol, day), so bars do not depend on the requested range.
+            draws = [np.random.default_rng([self.seed, *symbol.encode(), day.toordinal(), minutes]) for day in days]
+            steps = np.array([rng.normal(0, 0.0005 * minutes ** 0.5, shape[1]) for rng in draws]).reshape(shape)
+            noise = np.array([rng.uniform(0, 1, (3, shape[1])) for rng in draws]).reshape(shape[0], 3, shape[1])
+            close = self._close(symbol)[self.index.get_indexer(days)][:, None] * np.exp(np.cumsum(steps, axis=1))
+            spread = close * noise[:, 0] * 0.001
+            fields["Open"][symbol] = (close + spread * (2 * noise[:, 1] - 1)).ravel()
+            fields["High"][symbol] = (close + spread).ravel()
+            fields["Low"][symbol] = (close - spread).ravel()
+            fields["Close"][symbol] = close.ravel()
+            fields["Volume"][symbol] = (1000 + noise[:, 2] * 99000).round().ravel()
+        return pd.concat({field: pd.DataFrame(columns, index=index) for field, columns in fields.items()}, axis=1)
+
+    def download(self, tickers, start=None, end=None, interval="1d", **kwargs):
+        self.calls += 1
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        if interval.endswith("m"):
+            return self._intraday(symbols, start, end, interval)
+        mask = np.ones(len(self.index), dtype=bool)
+        if start is not None:
+            mask &= self.index >= pd.Timestamp(start)
+        if end is not None:
+            mask &= self.index < pd.Timestamp(end)
+        close = pd.DataFrame({symbol: self._close(symbol)[mask] for symbol in sorted(symbols)}, index=self.index[mask])
+        close.index.name = "Date"
+        # Same shape yfinance returns: (field, ticker) column MultiIndex.
+        return pd.concat({"Close": close}, axis=1)
+
+
+def make_housing_inputs(n_rows, seed=0):
+    """Returns `n_rows` random but valid rows for the housing price pipeline."""
+    rng = np.random.default_rng(seed)
+    size = rng.uniform(20, 150, n_rows).round(1)
+    choice = lambda options: rng.choice(options, n_rows)
+    data = pd.DataFrame({
+        'size': size,
+        'Czynsz': rng.uniform(0, 1500, n_rows).round(0),
+        'Ogrzewanie': choice(['miejskie', 'gazowe', 'elektryczne', 'inne']),
+        'Stan wykończenia': choice(['do wykończenia', 'do remontu', 'dobry', 'bardzo dobry']),
+        'Rynek': choice(['wtórny', 'pierwotny']),
+        'Forma własności': choice(['pełna własność', 'spółdzielcze własnościowe']),
+        'Typ ogłoszeniodawcy': choice(['prywatne', 'agencja']),
+        'neighborhood': choice(['Śródmieście', 'Mokotów', 'Wola', 'Ursynów', 'Bielany', 'Ochota']),
+    })
+    for amenity in ['has_balkon', 'has_taras', 'has_garaż_miejsce_parkingowe', 'has_piwnica',
+                    'has_oddzielna_kuchnia', 'has_ogródek', 'has_pom._użytkowe']:
+        data[amenity] = rng.integers(0, 2, n_rows)
+    return data
+
+
+def fit_housing_pipeline(n_rows=2000, seed=0):
+    """Fits a stand-in for the pickled housing model on synthetic rows.
+
+    Same structure as models/housing_price_predictor_model.pkl (imputed and scaled
+    numerical features, imputed one-hot categoricals, an XGBoost regressor on log
+    price), so predict_price can be benchmarked where the pickle does not load.
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+    from xgboost import XGBRegressor
+
+    from utils.housing import CATEGORICAL_FEATURES, NUMERICAL_FEATURES
+
+    data = make_housing_inputs(n_rows, seed=seed)
+    data['price_per_sqm'] = (data['Czynsz'] / data['size']).fillna(0)
+    rng = np.random.default_rng(seed)
+    log_price = np.log(data['size'] * rng.uniform(12_000, 25_000, n_rows))
+
+    preprocessor = ColumnTransformer([
+        ('num', Pipeline([('imputer', SimpleImputer(strategy='median')), ('scaler', StandardScaler())]), NUMERICAL_FEATURES),
+        ('cat', Pipeline([('imputer', SimpleImputer(strategy='most_frequent')),
+                          ('onehot', OneHotEncoder(handle_unknown='ignore'))]), CATEGORICAL_FEATURES),
+    ])
+    model = Pipeline([
+        ('preprocessor', preprocessor),
+        ('regressor', XGBRegressor(n_estimators=300, max_depth=6, learning_rate=0.1, random_state=seed)),
+    ])
+    return model.fit(data[NUMERICAL_FEATURES + CATEGORICAL_FEATURES], log_price)
+
+def make_otodom_scrape(n_rows, seed=0):
+    """Returns `n_rows` raw Otodom scrape rows with the display strings the scraper writes."""
+    rng = np.random.default_rng(seed)
+    choice = lambda options: rng.choice(options, n_rows)
+    districts = ['Śródmieście', 'Mokotów', 'Wola', 'Ursynów', 'Bielany', 'Praga-Południe', 'Targówek', 'Białołęka']
+    amenities = np.array(['balkon', 'taras', 'garaż/miejsce parkingowe', 'piwnica', 'oddzielna kuchnia', 'ogródek', 'pom. użytkowe'])
+    amenity_mask = rng.random((n_rows, len(amenities))) < 0.3
+    floors = rng.integers(0, 15, n_rows)
+    total_floors = floors + rng.integers(0, 10, n_rows)
+    floor_labels = np.where(floors == 0, 'parter', np.where(floors > 10, '> 10', floors.astype(str)))
+    return pd.DataFrame({
+        'price': [f"{price:,} zł".replace(",", " ") for price in rng.integers(300_000, 3_000_000, n_rows)],
+        'title': 'Mieszkanie na sprzedaż',
+        'location': [f"ul. Testowa {number}, {district}, Warszawa, mazowieckie"
+                     for number, district in zip(rng.integers(1, 5000, n_rows), choice(districts))],
+        'size': [f"{size}m²" for size in rng.uniform(20, 150, n_rows).round(2)],
+        'Ogrzewanie': choice(['miejskie', 'gazowe', 'brak informacji']),
+        'Piętro': np.char.add(np.char.add(floor_labels, '/'), total_floors.astype(str)),
+        'Czynsz': np.where(rng.random(n_rows) < 0.2, 'brak informacji', [f"{rent} zł" for rent in rng.integers(200, 1500, n_rows)]),
+        'Stan wykończenia': choice(['do zamieszkania', 'do wykończenia', 'do remontu', 'brak informacji']),
+        'Rynek': choice(['wtórny', 'pierwotny']),
+        'Forma własności': choice(['pełna własność', 'spółdzielcze wł. prawo do lokalu', 'brak informacji']),
+        'Dostępne od': choice(['brak informacji', '2025-03-01', '2025-06-30']),
+        'Typ ogłoszeniodawcy': choice(['prywatny', 'biuro nieruchomości', 'deweloper']),
+        'Informacje dodatkowe': ["\n".join(amenities[mask]) or 'brak informacji' for mask in amenity_mask],
+        'Unnamed: 13': '',
+    })
+
@@ -1,16 +1,27 @@
+import os
 import re
+import sqlite3
 import streamlit as st
-import requests
 
-WEBHOOK_URL = "https://hooks.zapier.com/hooks/catch/22023960/2lypoz3/"
+from forms.outbox import Outbox
+
+WEBHOOK_URL = os.getenv("CONTACT_WEBHOOK_URL", "https://hooks.zapier.com/hooks/catch/22023960/2lypoz3/")
+OUTBOX_PATH = os.getenv("CONTACT_OUTBOX_PATH", os.path.join(os.path.dirname(__file__), "outbox.sqlite3"))
 
 def is_valid_email(email):
     """Checks if an email address is valid using a regular expression."""
     email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
     return re.match(email_pattern, email) is not None
 
+@st.cache_resource
+def get_outbox():
+    """Returns the process-wide contact outbox with its delivery worker running."""
+    outbox = Outbox(OUTBOX_PATH, WEBHOOK_URL)
+    outbox.start()
+    return outbox
+
 def contact_form():
-    """Creates a contact form and sends the data to a webhook."""
+    """Creates a contact form and queues the data for delivery to a webhook."""
 
     with st.form("contact_form"):
         name = st.text_input("Name").strip()
@@ -39,17 +50,11 @@ def contact_form():
         data = {"name": name, "email": email, "message": message}
 
         try:
-            # Send the POST request to the webhook
-            response = requests.post(WEBHOOK_URL, json=data, timeout=10) #added timeout
-
-            # Check the response status code
-            if response.status_code == 200:
-                st.success("Message sent successfully!", icon="✅")
-            else:
-                st.error(f"Failed to send message. Status code: {response.status_code}. Response: {response.text}", icon="❌")
-
-        except requests.exceptions.RequestException as e:
-            # Handle any exceptions that may occur during the request
-            st.error(f"An error occurred while sending the message: {e}", icon="⚠️")
+            # Persist to the outbox; the background worker delivers it to the webhook
+            get_outbox().enqueue(data)
+            st.success("Message sent successfully!", icon="✅")
+
+        except sqlite3.Error as e:
+            st.error(f"An error occurred while saving the message: {e}", icon="⚠️")
         except Exception as generic_e:
-            st.error(f"A generic error occurred: {generic_e}", icon="🚨")
\ No newline at end of file
+            st.error(f"A generic error occurred: {generic_e}", icon="🚨")
@@ -0,0 +1,202 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- Outbox Schema ---
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    delivered_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (delivered_at, next_attempt_at);
+"""
+
+
+class Outbox:
+    """Durable SQLite queue of webhook payloads with a background delivery worker.
+
+    Submissions are committed to disk by `enqueue` and acknowledged straight away.
+    A daemon thread drains due messages in batches over a pooled HTTP session,
+    retrying failures with exponential backoff capped at `backoff_max`. A message
+    is only given up on once it is older than `max_age` seconds, so a webhook
+    outage shorter than that delays delivery but loses nothing. The worker logs
+    `metrics()` every `metrics_interval` seconds.
+    """
+
+    def __init__(self, path, webhook_url, batch_size=20, poll_interval=1.0,
+                 max_age=7 * 24 * 3600, backoff_base=2.0, backoff_max=300.0, timeout=10,
+                 metrics_interval=300.0):
+        self.path = path
+        self.webhook_url = webhook_url
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_age = max_age
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.metrics_interval = metrics_interval
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    # --- Producer Side ---
+    def enqueue(self, payload):
+        """Persists a payload and wakes the worker. Returns the message id."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO outbox (payload, created_at, next_attempt_at) VALUES (?, ?, ?)",
+                (json.dumps(payload), now, now),
+            )
+        self._wake.set()
+        return cursor.lastrowid
+
+    # --- Worker Lifecycle ---
+    def start(self):
+        """Starts the delivery worker if it is not already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="contact-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Signals the worker to finish its current batch and exit."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        next_report = time.monotonic() + self.metrics_interval
+        while not self._stop.is_set():
+            try:
+                delivered = self.deliver_batch()
+            except sqlite3.Error as e:
+                print(f"Outbox database error: {e}")
+                delivered = 0
+            except Exception as e:
+                # Never let one bad row or payload stop delivery for good.
+                print(f"Outbox worker error: {e!r}")
+                delivered = 0
+            # Keep draining while full batches are going out, otherwise sleep until woken.
+            if delivered < self.batch_size:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+            if time.monotonic() >= next_report:
+                next_report = time.monotonic() + self.metrics_interval
+                self._log_metrics()
+
+    # --- Delivery ---
+    def deliver_batch(self):
+        """Attempts delivery of up to `batch_size` due messages. Returns how many were sent."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload, attempts FROM outbox "
+                "WHERE delivered_at IS NULL AND created_at > ? AND next_attempt_at <= ? "
+                "ORDER BY id LIMIT ?",
+                (now - self.max_age, now, self.batch_size),
+            ).fetchall()
+
+        delivered = 0
+        for message_id, payload, attempts in rows:
+            try:
+                error = self._post(json.loads(payload))
+            except Exception as e:
+                # e.g. a corrupted payload: counted as a failed attempt so the rest of the queue moves on.
+                error = repr(e)
+            with self._lock:
+                if error is None:
+                    self._conn.execute(
+                        "UPDATE outbox SET delivered_at = ?, attempts = ?, last_error = NULL WHERE id = ?",
+                        (time.time(), attempts + 1, message_id),
+                    )
+                    delivered += 1
+                else:
+                    self._conn.execute(
+                        "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                        (attempts + 1, time.time() + self._backoff(attempts + 1), error, message_id),
+                    )
+        return delivered
+
+    def _post(self, payload):
+        try:
+            response = self._session.post(self.webhook_url, json=payload, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            return str(e)
+        if 200 <= response.status_code < 300:
+            return None
+        return f"Status code: {response.status_code}. Response: {response.text[:200]}"
+
+    def _backoff(self, attempts):
+        # Cap the exponent too: retries continue until max_age, so attempts keep growing.
+        delay = min(self.backoff_max, self.backoff_base ** min(attempts, 32))
+        return delay * random.uniform(0.5, 1.0)
+
+    # --- Metrics ---
+    def metrics(self, window=100):
+        """Returns queue depth, expired message count and delivery latency over the last `window` messages."""
+        expired_before = time.time() - self.max_age
+        with self._lock:
+            queue_depth, expired, delivered = self._conn.execute(
+                "SELECT "
+                "SUM(delivered_at IS NULL AND created_at > ?), "
+                "SUM(delivered_at IS NULL AND created_at <= ?), "
+                "SUM(delivered_at IS NOT NULL) "
+                "FROM outbox",
+                (expired_before, expired_before),
+            ).fetchone()
+            latencies = [row[0] for row in self._conn.execute(
+                "SELECT delivered_at - created_at FROM outbox WHERE delivered_at IS NOT NULL "
+                "ORDER BY delivered_at DESC LIMIT ?",
+                (window,),
+            )]
+
+        latencies.sort()
+
+        def percentile(q):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        return {
+            "queue_depth": queue_depth or 0,
+            "expired": expired or 0,
+            "delivered": delivered or 0,
+            "latency_p50": percentile(0.50),
+            "latency_p95": percentile(0.95),
+            "worker_alive": self._thread is not None and self._thread.is_alive(),
+        }
+
+    def _log_metrics(self):
+        try:
+            metrics = self.metrics()
+        except sqlite3.Error as e:
+            print(f"Outbox database error: {e}")
+            return
+        latency = "n/a" if metrics["latency_p50"] is None else \
+            f"p50 {metrics['latency_p50']:.1f}s, p95 {metrics['latency_p95']:.1f}s"
+        print(f"Contact outbox: {metrics['queue_depth']} queued, {metrics['expired']} expired, "
+              f"{metrics['delivered']} delivered, delivery latency {latency}")
@@ -1,9 +1,13 @@
 import streamlit as st
 
+from utils.assets import page_images
+
+images = page_images("about_me")
+
 # --- Header Section ---
 col1, col2 = st.columns([1, 3], gap="medium")
 with col1:
-    st.image("./assets/profile-pic.png", width=180)
+    st.image(images["assets/profile-pic.png"], width=180)
 
 with col2:
     st.title("Kevin Van Wallendael")
@@ -78,17 +82,17 @@ cols = st.columns(3)
 
 projects = [
     {
-        "image": "./assets/StockPortfolio.jpg",
+        "image": "assets/StockPortfolio.jpg",
         "caption": "Portfolio Analysis",
         "url": "https://github.com/KevinVanWallendael/StockPortfolioAnalyzer",
     },
     {
-        "image": "./assets/OtoDom.jpg",
+        "image": "assets/OtoDom.jpg",
         "caption": "Otodom Web Scraper",
         "url": "https://github.com/KevinVanWallendael/OtodomScraper",
     },
     {
-        "image": "./assets/PredictionModel.jpg",
+        "image": "assets/PredictionModel.jpg",
         "caption": "Warsaw Housing Prediction",
         "url": "https://github.com/KevinVanWallendael/HousingPricePrediction",
     },
@@ -97,7 +101,7 @@ projects = [
 for i, project in enumerate(projects):
     with cols[i]:
         st.image(
-            project["image"], use_container_width=True, caption=project["caption"]
+            images[project["image"]], use_container_width=True, caption=project["caption"]
         )
         st.markdown(f"[{project['caption']}]({project['url']})")
 
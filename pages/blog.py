@@ -1,5 +1,9 @@
 import streamlit as st
 
+from utils.assets import page_images
+
+images = page_images("blog")
+
 st.title("My Portfolio Blog")
 st.write("""
 Welcome to my portfolio blog! Here, I share insights and details about my projects, showcasing my skills in data science, web scraping, and financial analysis. 
@@ -78,7 +82,7 @@ with tabs[0]:
 
     st.write("### Technical Flow Chart")
     with st.expander("View Technical Flow Chart"):
-        st.image("./assets/StockFlow.png", use_container_width=True, caption="Stock Code Logic Flow")
+        st.image(images["assets/StockFlow.png"], use_container_width=True, caption="Stock Code Logic Flow")
 
 
     st.header("My Approach")
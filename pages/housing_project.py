@@ -1,15 +1,12 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import joblib
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-model = joblib.load('models/housing_price_predictor_model.pkl')
-preprocessor = joblib.load('models/preprocessor.pkl')
+from utils.housing import predict_price
+from utils.loaders import load_housing_model, load_otodom_data
 
-numerical_features = ['size', 'Czynsz', 'price_per_sqm', 'has_balkon', 'has_taras', 'has_garaż_miejsce_parkingowe', 'has_piwnica', 'has_oddzielna_kuchnia', 'has_ogródek', 'has_pom._użytkowe']
-categorical_features = ['Ogrzewanie', 'Stan wykończenia', 'Rynek', 'Forma własności', 'Typ ogłoszeniodawcy', 'neighborhood']
+model, preprocessor = load_housing_model()
 
 ogrzewanie_options = ['miejskie', 'gazowe', 'elektryczne', 'inne', 'brak', 'piece kaflowe', 'kotłownia']
 stan_wykonczenia_options = ['do wykończenia', 'do remontu', 'wysoki standard', 'dobry', 'bardzo dobry', 'developerski']
@@ -61,18 +58,8 @@ input_data = pd.DataFrame({
     'has_pom._użytkowe': [int(has_pom_uzytkowe)],
 })
 
-input_data['price_per_sqm'] = np.nan
-if size != 0:
-    input_data['price_per_sqm'] = input_data['Czynsz'] / size
-else:
-    input_data['price_per_sqm'] = 0
-
 if st.button('Estimate Price'):
-    input_data = input_data[numerical_features + categorical_features + ['price_per_sqm']]
-    input_data = input_data.drop('price_per_sqm', axis=1)
-    input_data['price_per_sqm'] = input_data['Czynsz'] / size if size != 0 else 0
-    log_price_pred = model.predict(input_data)
-    predicted_price = np.exp(log_price_pred)[0]
+    predicted_price = predict_price(model, input_data)[0]
     st.markdown(f"<p class='big-font'>Estimated Price: {predicted_price:,.2f} zł</p>", unsafe_allow_html=True)
 
     col_vis1, col_vis2 = st.columns(2)
@@ -137,9 +124,7 @@ if st.button('Estimate Price'):
 
     with st.expander("Price Distribution by Neighborhood"):
         st.write("Price Distribution by Neighborhood")
-        data = pd.read_csv(r'models/Otodom_Webscraped.csv')
-        data['price'] = data['price'].str.replace(' zł', '', regex=False).str.replace(' ', '', regex=False)
-        data['price'] = pd.to_numeric(data['price'], errors='coerce')
+        data = load_otodom_data()
 
         fig_price_dist, ax_price_dist = plt.subplots(figsize=(10, 6))
         sns.boxplot(x='neighborhood', y='price', data=data, ax=ax_price_dist, color="#4db6ac")
@@ -0,0 +1,97 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from utils.intraday import RESOLUTIONS, chart_resolution, periods_per_year
+from utils.loaders import get_intraday_store
+from utils.market_data import PREDEFINED_STOCKS, DEFAULT_TICKERS, BENCHMARK_TICKER, INTRADAY_REQUEST_DAYS
+from utils.price_matrix import PriceMatrix
+from utils.portfolio import calculate_risk_return_metrics, create_buy_sell_signals
+
+# yfinance keeps 1-minute bars for 30 days and 5-minute bars for 60 days.
+MAX_LOOKBACK_DAYS = {"1m": 29, "5m": 59}
+
+st.markdown("# ⏱️ Intraday Charts")
+st.markdown("Minute-level prices, signals and risk metrics, resampled to a readable chart resolution.")
+
+with st.expander("Intraday Settings", expanded=True):
+    col1, col2 = st.columns(2)
+
+    with col1:
+        tickers = st.multiselect("Stocks", options=PREDEFINED_STOCKS, default=DEFAULT_TICKERS)
+        interval = st.radio("Bar interval", list(INTRADAY_REQUEST_DAYS), horizontal=True)
+
+    with col2:
+        lookback_days = st.slider("Lookback (calendar days)", min_value=1, max_value=MAX_LOOKBACK_DAYS[interval], value=5)
+        resolutions = [name for name, minutes in RESOLUTIONS.items() if minutes >= int(interval.rstrip("m"))]
+        resolution_choice = st.selectbox("Chart resolution", ["Auto"] + resolutions)
+
+if tickers and st.button("Load Intraday Data"):
+    end_date = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+    start_date = end_date - pd.Timedelta(days=lookback_days)
+    n_days = len(pd.bdate_range(start_date, end_date, inclusive="left"))
+    resolution = chart_resolution(n_days, interval) if resolution_choice == "Auto" else resolution_choice
+
+    store = get_intraday_store(interval)
+    with st.spinner(f"Loading {interval} bars..."):
+        bars = store.resample(tickers + [BENCHMARK_TICKER], start_date, end_date, resolution)
+
+    close = bars["Close"] if not bars.empty else pd.DataFrame()
+    available = [ticker for ticker in tickers if ticker in close.columns]
+    if not available or BENCHMARK_TICKER not in close.columns:
+        st.error("No intraday data found for the selected stocks and lookback.")
+    else:
+        price_matrix = PriceMatrix.from_frames(close[available], close[BENCHMARK_TICKER])
+        bar_periods = periods_per_year(resolution)
+        st.caption(
+            f"{len(price_matrix):,} {resolution} bars per ticker. "
+            f"Bar store: {store.nbytes / 2**20:.1f} of {store.max_bytes / 2**20:.0f} MB, {len(store)} day chunks."
+        )
+
+        st.markdown("---")
+        st.subheader("Annualized Risk/Return")
+        rows = []
+        for ticker in available:
+            column = price_matrix.returns[:, price_matrix.positions([ticker])[0]]
+            annual_return, annual_volatility, sharpe_ratio, beta, treynor_ratio = calculate_risk_return_metrics(
+                column, price_matrix.benchmark_returns, periods_per_year=bar_periods
+            )
+            rows.append({
+                "Ticker": ticker,
+                "Annual Return": annual_return,
+                "Annual Volatility": annual_volatility,
+                "Sharpe Ratio": sharpe_ratio,
+                "Beta": beta,
+                "Treynor Ratio": treynor_ratio,
+            })
+        st.dataframe(
+            pd.DataFrame(rows),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "Annual Return": st.column_config.NumberColumn(format="percent"),
+                "Annual Volatility": st.column_config.NumberColumn(format="percent"),
+                "Sharpe Ratio": st.column_config.NumberColumn(format="%.2f"),
+                "Beta": st.column_config.NumberColumn(format="%.2f"),
+                "Treynor Ratio": st.column_config.NumberColumn(format="%.2f"),
+            },
+        )
+
+        st.markdown("---")
+        st.subheader("Signals")
+        st.write(f"Moving averages and RSI are computed over {resolution} bars (e.g. the 50-bar MA).")
+
+        for ticker in available:
+            st.write(f"### {ticker}")
+            stock = price_matrix.series(ticker).dropna()
+            signals, ma50, ma200, rsi = create_buy_sell_signals(stock)
+
+            latest_signal = signals.tail(1)
+            signal_emoji = "✅" if latest_signal['Signal'].values[0] == "Buy" else "❌"
+            st.markdown(f"**Recommendation:** {signal_emoji} {latest_signal['Signal'].values[0]} · **RSI Signal:** {latest_signal['RSI Signal'].values[0]}")
+
+            st.plotly_chart(px.line(stock, title=f"{ticker} Price ({resolution} bars)")\
+                .add_scatter(x=ma50.index, y=ma50, mode="lines", name="50-bar MA")\
+                .add_scatter(x=ma200.index, y=ma200, mode="lines", name="200-bar MA"))
+
+            st.plotly_chart(px.line(rsi, title=f"{ticker} RSI (Relative Strength Index)"))
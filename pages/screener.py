@@ -0,0 +1,67 @@
+import streamlit as st
+
+from utils.loaders import load_stock_data
+from utils.market_data import PREDEFINED_STOCKS
+from utils.screener import default_date_range, load_universe, run_screen
+
+st.markdown("# 🔎 Index Screener")
+st.markdown("Rank a whole index by the portfolio tracker's moving-average crossover and RSI signals.")
+
+default_start, default_end = default_date_range()
+
+with st.expander("Screener Settings", expanded=True):
+    col1, col2 = st.columns(2)
+
+    with col1:
+        universe_name = st.selectbox("Universe", ["S&P 500", "Predefined stocks"])
+        start_date = st.date_input("Start Date", value=default_start)
+        end_date = st.date_input("End Date", value=default_end)
+
+    with col2:
+        short_window = st.number_input("Short MA window (days)", min_value=5, max_value=200, value=50, step=5)
+        long_window = st.number_input("Long MA window (days)", min_value=20, max_value=400, value=200, step=10)
+        rsi_oversold, rsi_overbought = st.slider("RSI Buy / Sell thresholds", 0, 100, (30, 70))
+
+if short_window >= long_window:
+    st.error("The short MA window must be shorter than the long MA window.")
+elif st.button("Run Screener"):
+    tickers = load_universe() if universe_name == "S&P 500" else PREDEFINED_STOCKS
+    progress_bar = st.progress(0.0, text=f"Loading prices for {len(tickers)} tickers...")
+
+    def update_progress(done, total):
+        progress_bar.progress(done / total, text=f"Loading prices... chunk {done}/{total}")
+
+    results = run_screen(
+        tickers,
+        start_date.strftime('%Y-%m-%d'),
+        end_date.strftime('%Y-%m-%d'),
+        loader=load_stock_data,
+        progress=update_progress,
+        short_window=short_window,
+        long_window=long_window,
+        rsi_oversold=rsi_oversold,
+        rsi_overbought=rsi_overbought,
+    )
+    progress_bar.empty()
+
+    if results.empty:
+        st.error("No data found for the selected universe and date range.")
+    else:
+        col3, col4, col5 = st.columns(3)
+        col3.metric("Tickers screened", len(results))
+        col4.metric("MA Buy signals", int((results["Signal"] == "Buy").sum()))
+        col5.metric("RSI Buy signals", int((results["RSI Signal"] == "Buy").sum()))
+
+        st.dataframe(
+            results,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "Last Price": st.column_config.NumberColumn(format="%.2f"),
+                f"MA{short_window}": st.column_config.NumberColumn(format="%.2f"),
+                f"MA{long_window}": st.column_config.NumberColumn(format="%.2f"),
+                "MA Spread": st.column_config.NumberColumn(format="percent"),
+                "RSI": st.column_config.NumberColumn(format="%.1f"),
+                "Strength": st.column_config.NumberColumn(format="%.2f", help="z(MA spread) + z(50 - RSI)"),
+            },
+        )
@@ -0,0 +1,176 @@
+import io
+import os
+import threading
+
+from PIL import Image
+
+VARIANTS_DIR = "assets/variants"
+
+# Widths (in pixels) each page actually displays its images at. Fixed-width images
+# use their `st.image(width=...)`; container-width images use twice the CSS width
+# of their column so they stay sharp on high-DPI screens.
+PAGE_IMAGES = {
+    "about_me": {
+        "assets/profile-pic.png": 180,
+        "assets/StockPortfolio.jpg": 480,
+        "assets/OtoDom.jpg": 480,
+        "assets/PredictionModel.jpg": 480,
+    },
+    "blog": {
+        "assets/StockFlow.png": 1460,
+    },
+}
+
+JPEG_QUALITY = 82
+
+# What a plain st.image(path) sends, the baseline the savings are measured against:
+# the source resized to its fixed `width`, or to Streamlit's maximum content width
+# for container-width images, and re-encoded at quality 90.
+STREAMLIT_MAX_WIDTH = 2 * 730
+STREAMLIT_QUALITY = 90
+FIXED_WIDTH_IMAGES = {"assets/profile-pic.png"}
+
+# Page views between log lines with the bytes saved on each page.
+STATS_LOG_EVERY = 100
+
+_cache = {}
+_baseline_sizes = {}
+_stats = {}
+_lock = threading.Lock()
+
+
+# --- Variant Generation ---
+# st.image re-encodes anything that is not JPEG, PNG or GIF (WebP included) on every
+# rerun, so variants keep the format Streamlit would serve: JPEG for photos, and PNG
+# for PNG sources, palette-quantized when they are opaque diagrams.
+
+def _variant_path(path, width):
+    stem, ext = os.path.splitext(os.path.basename(path))
+    ext = ".jpg" if ext.lower() in (".jpg", ".jpeg") else ".png"
+    return os.path.join(VARIANTS_DIR, f"{stem}-{width}w{ext}")
+
+def _encode_variant(path, width):
+    image = Image.open(path)
+    if image.width > width:
+        image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+
+    output = io.BytesIO()
+    if image.format == "JPEG" or path.lower().endswith((".jpg", ".jpeg")):
+        image.convert("RGB").save(output, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    elif image.mode == "RGBA" and image.getchannel("A").getextrema()[0] < 255:
+        image.save(output, "PNG", optimize=True)
+    else:
+        image.convert("RGB").quantize(256).save(output, "PNG", optimize=True)
+    # Lossless PNGs of photos can come out larger than Streamlit's own encoding;
+    # never serve more than a plain st.image would.
+    baseline = _streamlit_encode(path, width)
+    return output.getvalue() if output.tell() < len(baseline) else baseline
+
+def build_variant(path, width):
+    """Returns the encoded variant bytes, regenerating the file on disk if the source is newer."""
+    variant_path = _variant_path(path, width)
+    if os.path.exists(variant_path) and os.path.getmtime(variant_path) >= os.path.getmtime(path):
+        with open(variant_path, "rb") as f:
+            return f.read()
+
+    data = _encode_variant(path, width)
+    try:
+        os.makedirs(VARIANTS_DIR, exist_ok=True)
+        with open(variant_path, "wb") as f:
+            f.write(data)
+    except OSError as e:
+        # A read-only deploy still works; the variant just lives in memory.
+        print(f"Could not save image variant {variant_path}: {e}")
+    return data
+
+def _streamlit_encode(path, width):
+    # The bytes st.image would have sent for the source at `path`, mirroring its resize and re-encode.
+    image = Image.open(path)
+    target = width if path in FIXED_WIDTH_IMAGES else STREAMLIT_MAX_WIDTH
+    image_format = "PNG" if image.mode in ("RGBA", "LA", "P") else "JPEG"
+    if image.width <= target and image.format == image_format:
+        with open(path, "rb") as f:
+            return f.read()
+    if image.width > target:
+        image = image.resize((target, int(image.height * target / image.width)), Image.BILINEAR)
+    if image_format == "JPEG":
+        image = image.convert("RGB")
+    output = io.BytesIO()
+    image.save(output, image_format, quality=STREAMLIT_QUALITY)
+    return output.getvalue()
+
+def streamlit_size(path, width):
+    """Bytes a plain st.image(path) would send for this image."""
+    return len(_streamlit_encode(path, width))
+
+def build_all_variants():
+    """Pre-generates every variant in PAGE_IMAGES and loads it into the process cache."""
+    for page in PAGE_IMAGES:
+        for path, width in PAGE_IMAGES[page].items():
+            _get_variant(path, width)
+
+
+# --- Cached Serving ---
+
+def _get_variant(path, width):
+    key = (path, width)
+    with _lock:
+        if key in _cache:
+            return _cache[key]
+    data = build_variant(path, width)
+    with _lock:
+        _cache[key] = data
+    return data
+
+def _get_streamlit_size(path, width):
+    key = (path, width)
+    with _lock:
+        if key in _baseline_sizes:
+            return _baseline_sizes[key]
+    size = streamlit_size(path, width)
+    with _lock:
+        _baseline_sizes[key] = size
+    return size
+
+def page_images(page):
+    """Returns {path: bytes} with the right variant of every image on `page` and records one page view.
+
+    Logs the bytes saved per view against plain st.image on the first view of each
+    page and every STATS_LOG_EVERY views after that.
+    """
+    images = {}
+    streamlit_bytes = 0
+    served_bytes = 0
+    for path, width in PAGE_IMAGES[page].items():
+        images[path] = _get_variant(path, width)
+        streamlit_bytes += _get_streamlit_size(path, width)
+        served_bytes += len(images[path])
+
+    with _lock:
+        stats = _stats.setdefault(page, {"views": 0, "streamlit_bytes": 0, "served_bytes": 0})
+        stats["views"] += 1
+        stats["streamlit_bytes"] += streamlit_bytes
+        stats["served_bytes"] += served_bytes
+        views = stats["views"]
+    if views % STATS_LOG_EVERY == 1:
+        saved = asset_stats()[page]["bytes_saved_per_view"]
+        print(f"Images on {page}: {views} views, {saved / 1024:.1f} KB saved per view vs. plain st.image")
+    return images
+
+def asset_stats():
+    """Returns per-page view counts and the image bytes saved per view, against plain st.image, since the process started."""
+    with _lock:
+        stats = {page: dict(fields) for page, fields in _stats.items()}
+    for fields in stats.values():
+        fields["bytes_saved_per_view"] = (fields["streamlit_bytes"] - fields["served_bytes"]) / fields["views"]
+    return stats
+
+
+if __name__ == "__main__":
+    for page, paths in PAGE_IMAGES.items():
+        for path, width in paths.items():
+            source = os.path.getsize(path)
+            baseline = streamlit_size(path, width)
+            variant = len(build_variant(path, width))
+            print(f"{page:10} {_variant_path(path, width):45} source {source:>9,}, st.image {baseline:>9,} -> "
+                  f"{variant:>9,} bytes ({1 - variant / baseline:.0%} smaller than st.image)")
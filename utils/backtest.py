@@ -0,0 +1,247 @@
+"""Vectorized backtests of the MA-crossover and RSI signals, with parameter sweeps.
+
+Strategies follow the rules of create_buy_sell_signals: the MA strategy is long
+while the short moving average is above the long one, the RSI strategy buys when
+RSI drops below the oversold threshold and sells when it rises above the
+overbought one. Positions are taken at the close of the signal day, so they earn
+the next day's return. Everything is computed on the whole (dates x tickers)
+PriceMatrix at once.
+
+Sweep a grid from the command line:
+
+    python -m utils.backtest --tickers AAPL MSFT NVDA --start 2015-01-01 --end 2025-01-01 \\
+        --strategy ma --short-windows 10 20 50 --long-windows 100 150 200 --workers 8 -o sweep.csv
+"""
+import argparse
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.market_data import fetch_stock_data
+from utils.price_matrix import PriceMatrix
+
+STRATEGY_PARAMS = {
+    "ma": ["short_window", "long_window"],
+    "rsi": ["rsi_period", "rsi_oversold", "rsi_overbought"],
+}
+
+# Backtester shared by every sweep task in a worker process, set by _init_worker.
+_backtester = None
+
+
+def _rolling_mean(csum, ccount, window):
+    # Rolling mean from prefix sums; NaN until the window holds `window` valid values,
+    # matching pandas rolling(window).mean().
+    out = np.full((csum.shape[0] - 1, csum.shape[1]), np.nan)
+    sums = csum[window:] - csum[:-window]
+    counts = ccount[window:] - ccount[:-window]
+    with np.errstate(invalid="ignore"):
+        out[window - 1:] = np.where(counts == window, sums / window, np.nan)
+    return out
+
+def _prefix_sums(values):
+    valid = np.isfinite(values)
+    csum = np.zeros((values.shape[0] + 1, values.shape[1]))
+    ccount = np.zeros((values.shape[0] + 1, values.shape[1]), dtype=np.int64)
+    np.cumsum(np.where(valid, values, 0.0), axis=0, out=csum[1:])
+    np.cumsum(valid, axis=0, out=ccount[1:])
+    return csum, ccount
+
+def _forward_fill(values):
+    rows = np.where(np.isnan(values), 0, np.arange(values.shape[0])[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return values[rows, np.arange(values.shape[1])]
+
+
+class Backtester:
+    """Runs signal strategies over a PriceMatrix, reusing prefix sums across parameter sets."""
+
+    def __init__(self, price_matrix, initial_investment=100000, transaction_cost=0.0, risk_free_rate=0.02):
+        self.price_matrix = price_matrix
+        self.initial_investment = initial_investment
+        self.transaction_cost = transaction_cost
+        self.risk_free_rate = risk_free_rate
+
+        prices = price_matrix.prices.astype(float)
+        self._price_sums = _prefix_sums(prices)
+        delta = np.vstack([np.full((1, prices.shape[1]), np.nan), np.diff(prices, axis=0)])
+        self._gain_sums = _prefix_sums(np.where(delta > 0, delta, 0.0))
+        self._loss_sums = _prefix_sums(np.where(delta < 0, -delta, 0.0))
+        self._asset_returns = np.nan_to_num(price_matrix.returns.astype(float))
+
+    # --- Signals to Positions ---
+    def moving_average(self, window):
+        return _rolling_mean(*self._price_sums, window)
+
+    def rsi(self, period=14):
+        gain = _rolling_mean(*self._gain_sums, period)
+        loss = _rolling_mean(*self._loss_sums, period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 100 - (100 / (1 + gain / loss))
+
+    def ma_positions(self, short_window=50, long_window=200):
+        """1 while the short MA is above the long MA ("Buy"), otherwise 0."""
+        return (self.moving_average(short_window) > self.moving_average(long_window)).astype(float)
+
+    def rsi_positions(self, rsi_period=14, rsi_oversold=30, rsi_overbought=70):
+        """Enters on an RSI "Buy", exits on an RSI "Sell" and holds in between."""
+        rsi = self.rsi(rsi_period)
+        events = np.where(rsi < rsi_oversold, 1.0, np.where(rsi > rsi_overbought, 0.0, np.nan))
+        return np.nan_to_num(_forward_fill(events))
+
+    def positions(self, strategy, **params):
+        if strategy == "ma":
+            return self.ma_positions(**params)
+        if strategy == "rsi":
+            return self.rsi_positions(**params)
+        raise ValueError(f"Unknown strategy '{strategy}'. Choose from {', '.join(STRATEGY_PARAMS)}.")
+
+    # --- Evaluation ---
+    def run(self, positions):
+        """Returns (equity DataFrame, drawdown DataFrame, per-ticker summary DataFrame)."""
+        held = positions[:-1]
+        turnover = np.abs(np.diff(positions, axis=0, prepend=0))[:-1]
+        strategy_returns = held * self._asset_returns - self.transaction_cost * turnover
+
+        equity = np.empty(positions.shape)
+        equity[0] = self.initial_investment
+        equity[1:] = self.initial_investment * np.cumprod(1 + strategy_returns, axis=0)
+        drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+
+        summary = self._summarize(held, strategy_returns, equity, drawdown)
+        dates = self.price_matrix.dates
+        tickers = self.price_matrix.tickers
+        return (pd.DataFrame(equity, index=dates, columns=tickers),
+                pd.DataFrame(drawdown, index=dates, columns=tickers),
+                summary)
+
+    def _summarize(self, held, strategy_returns, equity, drawdown):
+        n_days, n_tickers = held.shape
+        annual_return = strategy_returns.mean(axis=0) * 252
+        annual_volatility = strategy_returns.std(axis=0, ddof=1) * (252 ** 0.5)
+
+        # Trade-level hit rate: number every round trip per ticker, then sum log returns per trade.
+        in_market = held > 0
+        entries = in_market & ~np.vstack([np.zeros((1, n_tickers), dtype=bool), in_market[:-1]])
+        trade_ids = np.cumsum(entries, axis=0) * in_market
+        n_trades = entries.sum(axis=0)
+        offsets = np.arange(n_tickers) * (n_trades.max() + 1)
+        flat_ids = (trade_ids + offsets).ravel()
+        trade_log_returns = np.bincount(flat_ids, weights=np.log1p(strategy_returns).ravel() * in_market.ravel(),
+                                        minlength=n_tickers * (n_trades.max() + 1))
+        trade_log_returns = trade_log_returns.reshape(n_tickers, -1)[:, 1:]
+        trade_numbers = np.arange(1, trade_log_returns.shape[1] + 1)
+        wins = ((trade_log_returns > 0) & (trade_numbers <= n_trades[:, None])).sum(axis=1)
+
+        prices = self.price_matrix.prices
+        first_valid = np.isfinite(prices).argmax(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return pd.DataFrame({
+                "Ticker": self.price_matrix.tickers,
+                "Total Return": equity[-1] / self.initial_investment - 1,
+                "Buy & Hold Return": prices[-1] / prices[first_valid, np.arange(n_tickers)] - 1,
+                "Annual Return": annual_return,
+                "Annual Volatility": annual_volatility,
+                "Sharpe Ratio": (annual_return - self.risk_free_rate) / annual_volatility,
+                "Max Drawdown": drawdown.min(axis=0),
+                "Trades": n_trades,
+                "Hit Rate": np.where(n_trades > 0, wins / n_trades, np.nan),
+                "Exposure": in_market.mean(axis=0),
+            })
+
+    def backtest(self, strategy, **params):
+        return self.run(self.positions(strategy, **params))
+
+
+# --- Parameter Sweeps ---
+
+def parameter_grid(**values):
+    """Expands {name: [values]} into a list of parameter dicts (the cartesian product)."""
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(values[name] for name in names))]
+
+def _init_worker(price_matrix, backtest_kwargs):
+    global _backtester
+    _backtester = Backtester(price_matrix, **backtest_kwargs)
+
+def _evaluate(task):
+    strategy, params = task
+    if params.get("long_window", np.inf) <= params.get("short_window", 0):
+        return None
+    if params.get("rsi_overbought", np.inf) <= params.get("rsi_oversold", 0):
+        return None
+    summary = _backtester.backtest(strategy, **params)[2]
+    for name, value in reversed(list(params.items())):
+        summary.insert(1, name, value)
+    return summary
+
+def sweep(price_matrix, strategy, grid, workers=None, **backtest_kwargs):
+    """Backtests every parameter set in `grid` across a process pool.
+
+    Each worker builds one Backtester (and its prefix sums) for the shared matrix,
+    then evaluates its share of the grid vectorized across all tickers. Returns one
+    row per (parameter set, ticker); invalid combinations (short >= long window,
+    oversold >= overbought) are skipped.
+    """
+    tasks = [(strategy, params) for params in grid]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(price_matrix, backtest_kwargs)
+        summaries = [_evaluate(task) for task in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(price_matrix, backtest_kwargs)) as executor:
+            summaries = list(executor.map(_evaluate, tasks, chunksize=chunksize))
+    summaries = [summary for summary in summaries if summary is not None]
+    if not summaries:
+        return pd.DataFrame()
+    return pd.concat(summaries, ignore_index=True)
+
+def best_parameters(results, metric="Sharpe Ratio"):
+    """Returns the best parameter row per ticker from `sweep` results."""
+    ranked = results.dropna(subset=[metric])
+    return ranked.loc[ranked.groupby("Ticker")[metric].idxmax()].reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", nargs="+", required=True)
+    parser.add_argument("--start", required=True, help="Start date (YYYY-MM-DD).")
+    parser.add_argument("--end", required=True, help="End date (YYYY-MM-DD).")
+    parser.add_argument("--strategy", choices=list(STRATEGY_PARAMS), default="ma")
+    parser.add_argument("--short-windows", type=int, nargs="+", default=[20, 50])
+    parser.add_argument("--long-windows", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--rsi-periods", type=int, nargs="+", default=[14])
+    parser.add_argument("--rsi-oversold", type=float, nargs="+", default=[20, 25, 30])
+    parser.add_argument("--rsi-overbought", type=float, nargs="+", default=[70, 75, 80])
+    parser.add_argument("--transaction-cost", type=float, default=0.0, help="Cost per unit of turnover (0.001 = 10 bps).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("-o", "--output", default="backtest_sweep.csv")
+    args = parser.parse_args(argv)
+
+    stock_data = fetch_stock_data(args.tickers, args.start, args.end)
+    if stock_data.empty:
+        print("No price data found for the given tickers and date range.")
+        return 1
+
+    if args.strategy == "ma":
+        grid = parameter_grid(short_window=args.short_windows, long_window=args.long_windows)
+    else:
+        grid = parameter_grid(rsi_period=args.rsi_periods, rsi_oversold=args.rsi_oversold,
+                              rsi_overbought=args.rsi_overbought)
+
+    results = sweep(PriceMatrix.from_frames(stock_data), args.strategy, grid,
+                    workers=args.workers, transaction_cost=args.transaction_cost)
+    results.to_csv(args.output, index=False)
+    print(best_parameters(results).to_string(index=False))
+    print(f"{len(grid)} parameter sets x {stock_data.shape[1]} tickers -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
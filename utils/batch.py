@@ -0,0 +1,180 @@
+"""Headless batch portfolio analysis.
+
+Reads many portfolio definitions, downloads the union of their price history once,
+evaluates the portfolios in parallel across a process pool and writes one metrics
+row per portfolio:
+
+    python -m utils.batch portfolios.csv -o metrics.csv --workers 8
+
+CSV input needs the columns name, tickers, weights, start_date, end_date and
+initial_investment, with tickers and weights separated by ";" (e.g. "AAPL;MSFT"
+and "0.6;0.4"). Optional columns rebalance (none, monthly, quarterly, annually or
+threshold), rebalance_threshold and transaction_cost select a rebalancing
+schedule instead of buy-and-hold. JSON input is a list of objects with the same
+keys, where tickers and weights may be lists.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from utils.market_data import fetch_stock_data, fetch_benchmark_data
+from utils.portfolio import (
+    calculate_portfolio_value,
+    calculate_rebalanced_portfolio_value,
+    calculate_returns,
+    calculate_risk_return_metrics,
+)
+from utils.price_matrix import PriceMatrix
+
+METRIC_COLUMNS = ["annual_return", "annual_volatility", "sharpe_ratio", "beta", "treynor_ratio"]
+
+# Price matrix shared by every task in a worker process, set by _init_worker.
+_price_matrix = None
+
+
+# --- Input ---
+
+def _split(value):
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [item.strip() for item in str(value).split(";") if item.strip()]
+
+def _optional(record, key, default):
+    # Missing keys and empty CSV cells (read as NaN) fall back to the default.
+    value = record.get(key)
+    return default if value is None or pd.isna(value) or value == "" else value
+
+def _parse_portfolio(record, i):
+    tickers = [ticker.upper() for ticker in _split(record["tickers"])]
+    weights = [float(weight) for weight in _split(record["weights"])]
+    if len(tickers) != len(weights):
+        raise ValueError(f"{len(tickers)} tickers but {len(weights)} weights.")
+    return {
+        "name": str(_optional(record, "name", i)),
+        "allocations": dict(zip(tickers, weights)),
+        "start_date": pd.Timestamp(record["start_date"]).strftime('%Y-%m-%d'),
+        "end_date": pd.Timestamp(record["end_date"]).strftime('%Y-%m-%d'),
+        "initial_investment": float(_optional(record, "initial_investment", 100000)),
+        "rebalance": str(_optional(record, "rebalance", "none")).lower(),
+        "rebalance_threshold": float(_optional(record, "rebalance_threshold", 0.05)),
+        "transaction_cost": float(_optional(record, "transaction_cost", 0.0)),
+    }
+
+def read_portfolios(path):
+    """Reads portfolio definitions from a CSV or JSON file into a list of dicts.
+
+    Rows that cannot be parsed are kept as {"name", "error"} dicts, so they show up
+    as failed rows in the output instead of aborting the batch.
+    """
+    if path.lower().endswith(".json"):
+        with open(path) as f:
+            records = json.load(f)
+    else:
+        records = pd.read_csv(path, dtype=str).to_dict("records")
+
+    portfolios = []
+    for i, record in enumerate(records):
+        try:
+            portfolios.append(_parse_portfolio(record, i))
+        except Exception as e:
+            # A malformed row is reported in its own `error` column instead of failing the batch.
+            name = _optional(record, "name", i) if isinstance(record, dict) else i
+            portfolios.append({"name": str(name), "error": f"Invalid portfolio definition: {e}"})
+    return portfolios
+
+
+# --- Evaluation ---
+
+def _init_worker(price_matrix):
+    global _price_matrix
+    _price_matrix = price_matrix
+
+def evaluate_portfolio(portfolio, price_matrix=None):
+    """Returns the metrics row for one portfolio. Failures are reported in the `error` column."""
+    price_matrix = _price_matrix if price_matrix is None else price_matrix
+    row = {"name": portfolio["name"], "error": portfolio.get("error")}
+    if row["error"] is not None:
+        return row
+
+    try:
+        allocations = portfolio["allocations"]
+        if abs(sum(allocations.values()) - 1.0) > 1e-6:
+            raise ValueError("Portfolio weights must sum to 100%.")
+        missing = [ticker for ticker in allocations if ticker not in price_matrix]
+        if missing:
+            raise ValueError(f"No price data for {', '.join(missing)}.")
+
+        # yfinance treats end dates as exclusive; select() uses the same half-open window.
+        prices = price_matrix.select(list(allocations), portfolio["start_date"], portfolio["end_date"]).dropna()
+        if len(prices) == 0:
+            raise ValueError("No price data in the selected date range.")
+
+        rebalance = portfolio.get("rebalance", "none")
+        if rebalance == "none":
+            portfolio_value = calculate_portfolio_value(prices, allocations, portfolio["initial_investment"])
+        else:
+            portfolio_value = calculate_rebalanced_portfolio_value(
+                prices, allocations, portfolio["initial_investment"], frequency=rebalance,
+                threshold=portfolio.get("rebalance_threshold", 0.05),
+                transaction_cost=portfolio.get("transaction_cost", 0.0),
+            )[0]
+        metrics = calculate_risk_return_metrics(calculate_returns(portfolio_value), prices.benchmark_returns)
+        row.update(zip(METRIC_COLUMNS, metrics))
+        row["final_value"] = portfolio_value.iloc[-1]
+        row["total_return"] = portfolio_value.iloc[-1] / portfolio["initial_investment"] - 1
+    except Exception as e:
+        row["error"] = str(e)
+    return row
+
+def run_batch(portfolios, workers=None, chunksize=None):
+    """Fetches shared prices once and evaluates `portfolios` across a process pool."""
+    valid = [portfolio for portfolio in portfolios if portfolio.get("error") is None]
+    if not valid:
+        raise ValueError("No valid portfolio definitions in the batch.")
+    tickers = sorted({ticker for portfolio in valid for ticker in portfolio["allocations"]})
+    start_date = min(portfolio["start_date"] for portfolio in valid)
+    end_date = max(portfolio["end_date"] for portfolio in valid)
+
+    stock_data = fetch_stock_data(tickers, start_date, end_date)
+    benchmark_data = fetch_benchmark_data(start_date, end_date)
+    if stock_data.empty or benchmark_data.empty:
+        raise ValueError("Could not download price data for the batch.")
+    price_matrix = PriceMatrix.from_frames(stock_data, benchmark_data)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        rows = [evaluate_portfolio(portfolio, price_matrix) for portfolio in portfolios]
+    else:
+        chunksize = chunksize or max(1, len(portfolios) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(price_matrix,)) as executor:
+            rows = list(executor.map(evaluate_portfolio, portfolios, chunksize=chunksize))
+
+    return pd.DataFrame(rows, columns=["name"] + METRIC_COLUMNS + ["final_value", "total_return", "error"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or JSON file with portfolio definitions.")
+    parser.add_argument("-o", "--output", default="portfolio_metrics.csv", help="Where to write the metrics table (CSV).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--chunksize", type=int, default=None, help="Portfolios sent to a worker per task.")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    portfolios = read_portfolios(args.input)
+    metrics = run_batch(portfolios, workers=args.workers, chunksize=args.chunksize)
+    metrics.to_csv(args.output, index=False)
+
+    failed = metrics["error"].notna().sum()
+    print(f"Evaluated {len(metrics)} portfolios ({failed} failed) in {time.perf_counter() - started:.1f}s -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+import numpy as np
+
+HOUSING_MODEL_PATH = "models/housing_price_predictor_model.pkl"
+HOUSING_PREPROCESSOR_PATH = "models/preprocessor.pkl"
+
+NUMERICAL_FEATURES = ['size', 'Czynsz', 'price_per_sqm', 'has_balkon', 'has_taras', 'has_garaż_miejsce_parkingowe', 'has_piwnica', 'has_oddzielna_kuchnia', 'has_ogródek', 'has_pom._użytkowe']
+CATEGORICAL_FEATURES = ['Ogrzewanie', 'Stan wykończenia', 'Rynek', 'Forma własności', 'Typ ogłoszeniodawcy', 'neighborhood']
+
+# --- Prediction ---
+def predict_price(model, input_data):
+    """Predicts prices in zł for each row of `input_data` with the log-price pipeline."""
+    input_data = input_data[[f for f in NUMERICAL_FEATURES if f != 'price_per_sqm'] + CATEGORICAL_FEATURES].copy()
+    input_data['price_per_sqm'] = (input_data['Czynsz'] / input_data['size'].replace(0, np.nan)).fillna(0)
+    log_price_pred = model.predict(input_data)
+    return np.exp(log_price_pred)
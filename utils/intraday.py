@@ -0,0 +1,217 @@
+"""Compact storage and lazy resampling of intraday bars.
+
+Bars are kept per (ticker, trading day) as typed NumPy columns: minute of day as
+uint16, prices as float32 and volume as uint32, about 22 bytes per bar against
+~48 for a float64 DataFrame row with a timestamp index. Day chunks live in an LRU
+cache bounded by bytes, and `resample` aggregates one day chunk at a time, so
+only the bars at the chart's resolution are ever materialized together.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.market_data import (
+    EXCHANGE_TIMEZONE,
+    INTRADAY_FIELDS,
+    INTRADAY_INTERVALS,
+    INTRADAY_REQUEST_DAYS,
+    fetch_intraday_data,
+)
+
+# Bar widths offered for charts, in minutes; a regular session has 390 minutes.
+RESOLUTIONS = {"1min": 1, "5min": 5, "15min": 15, "30min": 30, "1h": 60, "1D": 1440}
+SESSION_MINUTES = 390
+MAX_CHART_POINTS = 2000
+INTRADAY_CACHE_MB = 64
+
+COLUMN_DTYPES = {
+    "minute": np.uint16,
+    "Open": np.float32,
+    "High": np.float32,
+    "Low": np.float32,
+    "Close": np.float32,
+    "Volume": np.uint32,
+}
+
+
+# --- Resolutions ---
+
+def bars_per_day(resolution):
+    return max(1, -(-SESSION_MINUTES // RESOLUTIONS[resolution]))
+
+def periods_per_year(resolution):
+    """Bars per year at `resolution`, for annualizing metrics computed on resampled bars."""
+    return 252 * bars_per_day(resolution)
+
+def chart_resolution(n_days, interval="1m", max_points=MAX_CHART_POINTS):
+    """Finest resolution, no finer than `interval`, that keeps `n_days` of bars under `max_points`."""
+    interval_minutes = int(interval.rstrip("m"))
+    for resolution, minutes in RESOLUTIONS.items():
+        if minutes >= interval_minutes and n_days * bars_per_day(resolution) <= max_points:
+            return resolution
+    return "1D"
+
+
+# --- Day Chunks ---
+
+def _to_chunks(bars, tickers):
+    """Splits a (field, ticker) OHLCV DataFrame into {(ticker, day): typed columns}."""
+    chunks = {}
+    if bars.empty:
+        return chunks
+    days = bars.index.normalize()
+    minutes = (bars.index - days) // pd.Timedelta(minutes=1)
+    for ticker in tickers:
+        if ticker not in bars.columns.get_level_values(1):
+            continue
+        frame = bars.xs(ticker, axis=1, level=1)
+        valid = frame["Close"].notna().to_numpy()
+        for day in np.unique(days[valid]):
+            rows = valid & (days == day)
+            columns = {"minute": np.asarray(minutes[rows], dtype=COLUMN_DTYPES["minute"])}
+            for field in INTRADAY_FIELDS:
+                values = frame[field].to_numpy()[rows]
+                if field == "Volume":
+                    values = np.clip(np.nan_to_num(values), 0, np.iinfo(np.uint32).max)
+                columns[field] = values.astype(COLUMN_DTYPES[field])
+            chunks[ticker, pd.Timestamp(day)] = columns
+    return chunks
+
+def _request_windows(days, max_days):
+    """Splits sorted weekdays into runs of adjacent weekdays spanning at most `max_days` calendar days."""
+    windows = []
+    for day in days:
+        last = windows[-1] if windows else None
+        if last and day == last[-1] + pd.offsets.BDay(1) and day - last[0] < pd.Timedelta(days=max_days):
+            last.append(day)
+        else:
+            windows.append([day])
+    return windows
+
+def _chunk_nbytes(chunk):
+    return sum(column.nbytes for column in chunk.values())
+
+def resample_chunk(chunk, day, resolution):
+    """Aggregates one day chunk into OHLCV bars of `resolution`, labelled by their start."""
+    step = RESOLUTIONS[resolution]
+    buckets = chunk["minute"] // step
+    starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+    index = pd.Timestamp(day) + pd.to_timedelta(buckets[starts].astype(np.int64) * step, unit="min")
+    return pd.DataFrame({
+        "Open": chunk["Open"][starts],
+        "High": np.maximum.reduceat(chunk["High"], starts),
+        "Low": np.minimum.reduceat(chunk["Low"], starts),
+        "Close": chunk["Close"][ends],
+        "Volume": np.add.reduceat(chunk["Volume"].astype(np.int64), starts),
+    }, index=index)
+
+
+class IntradayStore:
+    """LRU store of intraday day chunks, fetched on demand and bounded by `max_bytes`.
+
+    Past trading days are immutable, so they are cached until evicted; bars for
+    the current day are always fetched again. Safe to share between sessions.
+    """
+
+    def __init__(self, interval="1m", max_bytes=INTRADAY_CACHE_MB * 2**20, fetcher=fetch_intraday_data):
+        if interval not in INTRADAY_INTERVALS:
+            raise ValueError(f"Unsupported intraday interval '{interval}'. Choose from {', '.join(INTRADAY_INTERVALS)}.")
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.fetcher = fetcher
+        self.nbytes = 0
+        self.fetches = 0
+        self._chunks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def _get(self, key):
+        with self._lock:
+            if key not in self._chunks:
+                raise KeyError(key)
+            self._chunks.move_to_end(key)
+            return self._chunks[key]
+
+    def _put(self, key, chunk):
+        with self._lock:
+            if key in self._chunks:
+                self.nbytes -= _chunk_nbytes(self._chunks.pop(key))
+            self._chunks[key] = chunk
+            self.nbytes += _chunk_nbytes(chunk)
+            while self.nbytes > self.max_bytes and len(self._chunks) > 1:
+                self.nbytes -= _chunk_nbytes(self._chunks.popitem(last=False)[1])
+
+    def _fetch(self, tickers, days):
+        # One request per window of adjacent missing days. A ticker's days without
+        # bars (holidays) are stored as empty chunks so they are not requested
+        # again, but only if the request returned bars for that ticker: a failed
+        # download stores nothing, so its days are retried on the next call.
+        today = pd.Timestamp.now(tz=EXCHANGE_TIMEZONE).normalize().tz_localize(None)
+        fetched = {}
+        for window in _request_windows(days, INTRADAY_REQUEST_DAYS[self.interval]):
+            bars = self.fetcher(list(tickers), window[0].strftime('%Y-%m-%d'),
+                                (window[-1] + pd.Timedelta(days=1)).strftime('%Y-%m-%d'), self.interval)
+            self.fetches += 1
+            chunks = _to_chunks(bars, tickers)
+            for ticker in {ticker for ticker, _ in chunks}:
+                for day in window:
+                    chunk = chunks.get((ticker, day))
+                    if chunk is None:
+                        chunk = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+                    fetched[ticker, day] = chunk
+                    if day < today:
+                        self._put((ticker, day), chunk)
+        return fetched
+
+    def chunks(self, tickers, start_date, end_date):
+        """Yields (day, {ticker: chunk}) for the weekdays in [start_date, end_date).
+
+        Tickers whose bars could not be downloaded for a day are left out of it.
+        """
+        days = pd.bdate_range(start_date, end_date, inclusive="left")
+        for batch in _request_windows(days, INTRADAY_REQUEST_DAYS[self.interval]):
+            found, missing_days = {}, []
+            for day in batch:
+                for ticker in tickers:
+                    try:
+                        found[ticker, day] = self._get((ticker, day))
+                    except KeyError:
+                        missing_days.append(day)
+                        break
+            if missing_days:
+                found.update(self._fetch(tickers, missing_days))
+            for day in batch:
+                yield day, {
+                    ticker: found[ticker, day] for ticker in tickers
+                    if (ticker, day) in found and len(found[ticker, day]["minute"])
+                }
+
+    def resample(self, tickers, start_date, end_date, resolution=None):
+        """Returns OHLCV bars of `resolution` with a (field, ticker) column MultiIndex.
+
+        The layout matches `fetch_stock_data`'s download, so `["Close"]` can go
+        straight into PriceMatrix.from_frames and the daily signal functions.
+        Defaults to `chart_resolution` for the requested span.
+        """
+        tickers = list(tickers)
+        if resolution is None:
+            n_days = len(pd.bdate_range(start_date, end_date, inclusive="left"))
+            resolution = chart_resolution(n_days, self.interval)
+        if RESOLUTIONS[resolution] < int(self.interval.rstrip("m")):
+            raise ValueError(f"Cannot resample {self.interval} bars to the finer resolution {resolution}.")
+
+        frames = {ticker: [] for ticker in tickers}
+        for day, day_chunks in self.chunks(tickers, start_date, end_date):
+            for ticker, chunk in day_chunks.items():
+                frames[ticker].append(resample_chunk(chunk, day, resolution))
+
+        resampled = {ticker: pd.concat(parts) for ticker, parts in frames.items() if parts}
+        if not resampled:
+            return pd.DataFrame()
+        bars = pd.concat(resampled, axis=1).swaplevel(axis=1).sort_index(axis=1)
+        return bars[INTRADAY_FIELDS]
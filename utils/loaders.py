@@ -0,0 +1,84 @@
+import os
+
+import joblib
+import pandas as pd
+import streamlit as st
+
+from utils.housing import HOUSING_MODEL_PATH, HOUSING_PREPROCESSOR_PATH
+from utils.intraday import IntradayStore
+from utils.market_data import fetch_stock_data, fetch_benchmark_data
+from utils.otodom import OTODOM_STORE_PATH, parse_listings, read_scrape, read_store
+
+OTODOM_DATA_PATH = "models/Otodom_Webscraped.csv"
+
+PRICE_CACHE_TTL = 60 * 60
+# Picks up batches ingested into the Otodom store while the server is running.
+OTODOM_CACHE_TTL = 60 * 60
+
+# --- Shared Caches ---
+# These are process-wide, so anything loaded here (including by the warm-up
+# thread started from app.py) is reused by every session.
+
+# `_prefetched` is left out of the cache key (leading underscore): a refresh downloads
+# outside the cache and stores the result under the usual key only if it succeeded.
+
+@st.cache_data(ttl=PRICE_CACHE_TTL, show_spinner=False)
+def _load_stock_data(tickers, start_date, end_date, _prefetched=None):
+    return _prefetched if _prefetched is not None else fetch_stock_data(list(tickers), start_date, end_date)
+
+@st.cache_data(ttl=PRICE_CACHE_TTL, show_spinner=False)
+def _load_benchmark_data(start_date, end_date, _prefetched=None):
+    return _prefetched if _prefetched is not None else fetch_benchmark_data(start_date, end_date)
+
+def load_stock_data(tickers, start_date, end_date, refresh=False):
+    """Cached `fetch_stock_data`. Failed downloads are evicted so they are retried on the next call.
+
+    With `refresh`, downloads again and replaces the cached prices only if the
+    download succeeds; otherwise the cached prices keep being served.
+    """
+    tickers = tuple(tickers)
+    if refresh:
+        fresh = fetch_stock_data(list(tickers), start_date, end_date)
+        if not fresh.empty:
+            _load_stock_data.clear(tickers, start_date, end_date)
+            return _load_stock_data(tickers, start_date, end_date, _prefetched=fresh)
+    stock_data = _load_stock_data(tickers, start_date, end_date)
+    if stock_data.empty:
+        _load_stock_data.clear(tickers, start_date, end_date)
+    return stock_data
+
+def load_benchmark_data(start_date, end_date, refresh=False):
+    """Cached `fetch_benchmark_data`. Failed downloads are evicted so they are retried on the next call.
+
+    `refresh` replaces the cached prices only if the new download succeeds.
+    """
+    if refresh:
+        fresh = fetch_benchmark_data(start_date, end_date)
+        if not fresh.empty:
+            _load_benchmark_data.clear(start_date, end_date)
+            return _load_benchmark_data(start_date, end_date, _prefetched=fresh)
+    benchmark_data = _load_benchmark_data(start_date, end_date)
+    if benchmark_data.empty:
+        _load_benchmark_data.clear(start_date, end_date)
+    return benchmark_data
+
+@st.cache_resource(show_spinner=False)
+def get_intraday_store(interval):
+    """One memory-bounded intraday bar store per interval, shared by every session."""
+    return IntradayStore(interval)
+
+@st.cache_resource(show_spinner=False)
+def load_housing_model():
+    """Loads the housing price pipeline and its fitted preprocessor once per process."""
+    model = joblib.load(HOUSING_MODEL_PATH)
+    preprocessor = joblib.load(HOUSING_PREPROCESSOR_PATH)
+    return model, preprocessor
+
+@st.cache_data(ttl=OTODOM_CACHE_TTL, show_spinner=False)
+def load_otodom_data():
+    """Loads the typed Otodom listings from the ingested store, or parses the bundled scrape if there is none."""
+    data = read_store(OTODOM_STORE_PATH)
+    if data.empty:
+        scraped_at = pd.Timestamp(os.path.getmtime(OTODOM_DATA_PATH), unit="s")
+        data = parse_listings(read_scrape(OTODOM_DATA_PATH), scraped_at)
+    return data
@@ -0,0 +1,65 @@
+import yfinance as yf
+import pandas as pd
+
+PREDEFINED_STOCKS = ["AAPL", "MSFT", "GOOG", "AMZN", "TSLA", "META", "NFLX", "NVDA", "BRK-B", "JPM"]
+DEFAULT_TICKERS = ["AAPL", "MSFT"]
+DEFAULT_START_DATE = "2022-01-01"
+DEFAULT_END_DATE = "2023-01-01"
+BENCHMARK_TICKER = "^GSPC"
+
+INTRADAY_INTERVALS = ["1m", "5m"]
+INTRADAY_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+# Longest span, in calendar days, yfinance serves in one intraday request.
+INTRADAY_REQUEST_DAYS = {"1m": 7, "5m": 59}
+EXCHANGE_TIMEZONE = "America/New_York"
+
+# --- Stock Data Functions ---
+
+def fetch_stock_data(tickers, start_date, end_date):
+    try:
+        stock_data = yf.download(tickers, start=start_date, end=end_date)['Close']
+        if isinstance(stock_data, pd.Series):
+            stock_data = stock_data.to_frame()
+        stock_data.dropna(axis=1, how="all", inplace=True)
+        
+        if stock_data.empty:
+            raise ValueError("No valid stock data found for the given tickers and date range.")
+        return stock_data
+    except Exception as e:
+        print(f"Error fetching stock data: {e}")
+        return pd.DataFrame() 
+
+def fetch_benchmark_data(start_date, end_date):
+    try:
+        benchmark_data = yf.download(BENCHMARK_TICKER, start=start_date, end=end_date)['Close']
+
+        if benchmark_data.empty:
+            raise ValueError("No benchmark data found for the given date range.")
+        return benchmark_data
+    except Exception as e:
+        print(f"Error fetching benchmark data: {e}")
+        return pd.Series()
+
+# --- Intraday Data Functions ---
+
+def fetch_intraday_data(tickers, start_date, end_date, interval="1m"):
+    """Downloads intraday OHLCV bars with a (field, ticker) column MultiIndex.
+
+    Timestamps are converted to naive exchange-local time. Returns an empty
+    DataFrame when nothing could be downloaded.
+    """
+    try:
+        if interval not in INTRADAY_INTERVALS:
+            raise ValueError(f"Unsupported intraday interval '{interval}'.")
+        bars = yf.download(tickers, start=start_date, end=end_date, interval=interval, progress=False)
+        if bars.empty:
+            raise ValueError("No intraday data found for the given tickers and date range.")
+        if not isinstance(bars.columns, pd.MultiIndex):
+            symbol = tickers if isinstance(tickers, str) else tickers[0]
+            bars.columns = pd.MultiIndex.from_product([bars.columns, [symbol]])
+        if bars.index.tz is not None:
+            bars.index = bars.index.tz_convert(EXCHANGE_TIMEZONE).tz_localize(None)
+        return bars[INTRADAY_FIELDS]
+    except Exception as e:
+        print(f"Error fetching intraday data: {e}")
+        return pd.DataFrame()
@@ -0,0 +1,229 @@
+"""Ingestion of raw Otodom scrapes into a typed, deduplicated columnar store.
+
+Raw scrapes hold display strings ("689 890 zł", "35m²", "parter/4") and
+newline-separated amenity lists. `parse_listings` turns a whole scrape into the
+typed schema with vectorized string operations, and `ingest` appends only new or
+changed listings to a directory of Parquet files:
+
+    python -m utils.otodom scrape_2024_06.csv scrape_2024_07.csv --store models/otodom_store
+    python -m utils.otodom --compact
+
+Scrapes carry no listing ID, so listings are identified by a hash of their
+address, size, floor and market. A listing seen again with a different price or
+details is stored as a newer version; readers keep the latest version.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.housing import NUMERICAL_FEATURES
+
+OTODOM_STORE_PATH = "models/otodom_store"
+MISSING = "brak informacji"
+
+AMENITY_COLUMNS = [feature for feature in NUMERICAL_FEATURES if feature.startswith("has_")]
+CATEGORICAL_COLUMNS = ["Ogrzewanie", "Stan wykończenia", "Rynek", "Forma własności", "Typ ogłoszeniodawcy", "neighborhood"]
+IDENTITY_COLUMNS = ["location", "size", "floor", "total_floors", "Rynek"]
+SCHEMA = {
+    "listing_id": "uint64",
+    "scraped_at": "datetime64[ns]",
+    "price": "float64",
+    "size": "float32",
+    "Czynsz": "float32",
+    "floor": "Int8",
+    "total_floors": "Int8",
+    "location": "string",
+    **{column: "category" for column in CATEGORICAL_COLUMNS},
+    "available_from": "datetime64[ns]",
+    **{column: "int8" for column in AMENITY_COLUMNS},
+}
+
+
+# --- Parsing ---
+
+def _amenity_column(name):
+    # "garaż/miejsce parkingowe" -> "has_garaż_miejsce_parkingowe", as in the model's features.
+    return "has_" + name.strip().replace(" ", "_").replace("/", "_")
+
+def _on_unique(values, parse):
+    # Scrapes repeat a handful of distinct strings per column, so parse each one once.
+    codes, uniques = pd.factorize(values.astype("string"))
+    parsed = parse(pd.Series(uniques, dtype="string"))
+    return parsed.take(codes).where(codes >= 0).reset_index(drop=True).set_axis(values.index)
+
+def _parse_number(values):
+    # "1 475 zł", "34,73m²", "0" -> float; anything without digits ("brak informacji") -> NaN.
+    cleaned = values.astype("string").str.replace(",", ".", regex=False).str.replace(r"[^\d.]", "", regex=True)
+    return pd.to_numeric(cleaned.replace("", pd.NA), errors="coerce")
+
+def _parse_floor(values):
+    # "parter/4" -> (0, 4), "> 10/24" -> (11, 24), "suterena" -> (-1, NA). "> 10" is stored
+    # as 11, the lowest floor it can be.
+    parts = values.astype("string").str.extract(r"^\s*(parter|suterena|>\s*10|\d+)\s*(?:/\s*(\d+))?\s*$")
+    floor = parts[0].replace({"parter": "0", "suterena": "-1"}).str.replace(r">\s*10", "11", regex=True)
+    return pd.to_numeric(floor).astype("Int8"), pd.to_numeric(parts[1]).astype("Int8")
+
+def parse_listings(raw, scraped_at=None):
+    """Parses a raw Otodom scrape DataFrame into the typed SCHEMA, one row per listing.
+
+    Unknown columns (e.g. "Unnamed: 13") are dropped, "brak informacji" becomes
+    missing, and duplicate listings within the scrape are collapsed to the last one.
+    """
+    scraped_at = pd.Timestamp(scraped_at or pd.Timestamp.now()).tz_localize(None)
+    data = pd.DataFrame(index=raw.index)
+    data["scraped_at"] = np.full(len(raw), scraped_at, dtype="datetime64[ns]")
+    data["price"] = _parse_number(raw["price"]).astype("float64")
+    data["size"] = _parse_number(raw["size"]).astype("float32")
+    data["Czynsz"] = _parse_number(raw["Czynsz"]).astype("float32")
+    data["floor"] = _on_unique(raw["Piętro"], lambda floors: _parse_floor(floors)[0]).astype("Int8")
+    data["total_floors"] = _on_unique(raw["Piętro"], lambda floors: _parse_floor(floors)[1]).astype("Int8")
+    data["location"] = raw["location"].astype("string").str.strip()
+
+    for column in CATEGORICAL_COLUMNS[:-1]:
+        data[column] = raw[column].astype("string").str.strip().replace(MISSING, pd.NA).astype("category")
+    # District: the part before the city and voivodeship, e.g. "..., Praga-Północ, Warszawa, mazowieckie".
+    data["neighborhood"] = data["location"].str.rsplit(",", n=3).str[-3].str.strip().astype("category")
+    data["available_from"] = _on_unique(raw["Dostępne od"], lambda dates: pd.to_datetime(dates.replace(MISSING, pd.NA), errors="coerce"))
+
+    amenity_lists = raw["Informacje dodatkowe"].fillna("").astype(str).str.replace(r"\s*\n\s*", "\n", regex=True).str.strip()
+    amenities = amenity_lists.str.get_dummies(sep="\n")
+    amenities.columns = [_amenity_column(name) for name in amenities.columns]
+    for column in AMENITY_COLUMNS:
+        data[column] = amenities[column].to_numpy(dtype="int8") if column in amenities else np.zeros(len(raw), dtype="int8")
+
+    identity = data[IDENTITY_COLUMNS].astype("string").fillna("").apply(lambda column: column.str.lower())
+    data.insert(0, "listing_id", pd.util.hash_pandas_object(identity, index=False).to_numpy())
+    data = data.drop_duplicates("listing_id", keep="last").reset_index(drop=True)
+    return data.astype(SCHEMA)
+
+def read_scrape(path):
+    """Reads a raw scrape CSV with every column as text."""
+    return pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""])
+
+
+# --- Columnar Store ---
+
+def _store_files(store_path):
+    return sorted(glob.glob(os.path.join(store_path, "part-*.parquet")))
+
+def _write_part(data, store_path):
+    # Written under a temporary name and renamed into place, so readers globbing
+    # part-*.parquet never see a half-written file.
+    os.makedirs(store_path, exist_ok=True)
+    stamp = pd.Timestamp.now().strftime("%Y%m%dT%H%M%S%f")
+    path = os.path.join(store_path, f"part-{stamp}.parquet")
+    temporary = os.path.join(store_path, f".tmp-{stamp}-{os.getpid()}.parquet")
+    try:
+        data.to_parquet(temporary, engine="pyarrow", index=False)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return path
+
+def _read_parts(files, columns=None):
+    # Files can vanish between the glob and the read when a compaction removes them;
+    # the compacted file holds their rows, so skip them.
+    parts = []
+    for path in files:
+        try:
+            parts.append(pd.read_parquet(path, columns=columns))
+        except FileNotFoundError:
+            continue
+    return parts
+
+def _version_hash(data):
+    # Everything except the identity and scrape time: a changed hash means a new version.
+    columns = [column for column in SCHEMA if column not in ("listing_id", "scraped_at")]
+    return pd.util.hash_pandas_object(data[columns], index=False).to_numpy()
+
+def read_store(store_path=OTODOM_STORE_PATH, columns=None):
+    """Returns the latest version of every listing in the store (empty if there is none)."""
+    read_columns = None if columns is None else list(dict.fromkeys(["listing_id", "scraped_at", *columns]))
+    parts = _read_parts(_store_files(store_path), read_columns)
+    if not parts:
+        empty = pd.DataFrame(columns=list(SCHEMA)).astype(SCHEMA)
+        return empty if columns is None else empty[columns]
+    data = pd.concat(parts, ignore_index=True)
+    data = data.sort_values("scraped_at", kind="stable").drop_duplicates("listing_id", keep="last")
+    for column in CATEGORICAL_COLUMNS:
+        if column in data:
+            data[column] = data[column].astype("category")
+    data = data.reset_index(drop=True)
+    return data if columns is None else data[columns]
+
+def ingest(listings, store_path=OTODOM_STORE_PATH):
+    """Appends new and changed listings to the store as one Parquet file.
+
+    Returns counts of new, updated and unchanged listings.
+    """
+    existing = read_store(store_path)
+    known = pd.Series(_version_hash(existing), index=existing["listing_id"].to_numpy())
+    versions = _version_hash(listings)
+    ids = listings["listing_id"].to_numpy()
+
+    is_known = np.isin(ids, known.index)
+    unchanged = np.zeros(len(listings), dtype=bool)
+    unchanged[is_known] = known.reindex(ids[is_known]).to_numpy() == versions[is_known]
+    changes = listings[~unchanged]
+
+    if len(changes):
+        _write_part(changes, store_path)
+    return {
+        "new": int((~is_known).sum()),
+        "updated": int((is_known & ~unchanged).sum()),
+        "unchanged": int(unchanged.sum()),
+    }
+
+def compact(store_path=OTODOM_STORE_PATH):
+    """Rewrites the store as a single file holding only the latest version of each listing.
+
+    Returns the number of files merged (0 if the store already is a single file).
+    """
+    files = _store_files(store_path)
+    if len(files) <= 1:
+        return 0
+    latest = read_store(store_path)
+    _write_part(latest, store_path)
+    # The merged file is in place before the old parts go, so readers see every
+    # listing throughout (possibly twice, which read_store deduplicates).
+    for path in files:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return len(files)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scrapes", nargs="*", help="Raw scrape CSV files, ingested in the given order.")
+    parser.add_argument("--store", default=OTODOM_STORE_PATH)
+    parser.add_argument("--scraped-at", default=None, help="Scrape time (default: now); applies to every file.")
+    parser.add_argument("--compact", action="store_true", help="Merge the store into one file after ingesting.")
+    args = parser.parse_args(argv)
+
+    if not args.scrapes and not args.compact:
+        parser.error("Give at least one scrape file or --compact.")
+
+    for path in args.scrapes:
+        started = time.perf_counter()
+        raw = read_scrape(path)
+        listings = parse_listings(raw, args.scraped_at)
+        counts = ingest(listings, args.store)
+        print(f"{path}: {len(raw)} rows -> {len(listings)} listings "
+              f"({counts['new']} new, {counts['updated']} updated, {counts['unchanged']} unchanged) "
+              f"in {time.perf_counter() - started:.2f}s")
+    if args.compact:
+        merged = compact(args.store)
+        print(f"Merged {merged} files in {args.store}" if merged else f"{args.store} is already compact")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import pandas as pd
+import numpy as np
+from io import BytesIO
+from fpdf import FPDF
+
+# --- Portfolio Value Calculations ---
+def calculate_portfolio_value(price_matrix, allocations, initial_investment):
+    prices = price_matrix.prices[:, price_matrix.positions(allocations)]
+    normalized_prices = prices / prices[0]
+    portfolio_weights = np.fromiter(allocations.values(), dtype=float, count=len(allocations))
+    portfolio_value = normalized_prices @ portfolio_weights * initial_investment
+    return pd.Series(portfolio_value, index=price_matrix.dates)
+
+REBALANCE_FREQUENCIES = {"none": None, "monthly": "M", "quarterly": "Q", "annually": "Y", "threshold": None}
+
+def rebalance_dates(dates, frequency):
+    """Row positions of the first trading day of every new calendar period after the first."""
+    periods = pd.DatetimeIndex(dates).to_period(REBALANCE_FREQUENCIES[frequency]).asi8
+    return np.flatnonzero(periods[1:] != periods[:-1]) + 1
+
+def _first_drift_breach(prices, weights, threshold, block=64):
+    # Position (relative to prices[0]) of the first day any weight drifts more than
+    # `threshold` from its target, scanning growing blocks of days at once.
+    start = 1
+    while start < len(prices):
+        stop = min(start + block, len(prices))
+        holdings = weights * (prices[start:stop] / prices[0])
+        drift = np.abs(holdings / holdings.sum(axis=1, keepdims=True) - weights).max(axis=1)
+        breaches = np.flatnonzero(drift > threshold)
+        if len(breaches):
+            return start + breaches[0]
+        start, block = stop, block * 2
+    return None
+
+def calculate_rebalanced_portfolio_value(price_matrix, allocations, initial_investment, frequency="monthly",
+                                         threshold=0.05, transaction_cost=0.0):
+    """Portfolio value when holdings are reset to the target weights periodically.
+
+    `frequency` is "monthly", "quarterly" or "annually" (first trading day of each
+    period), "threshold" (whenever any weight drifts more than `threshold` from its
+    target) or "none" (buy-and-hold). Each rebalance costs `transaction_cost` times
+    the traded fraction of the portfolio. Between rebalances the value is one
+    matrix product over the whole period, so only rebalance dates are iterated.
+    Returns (value Series, DataFrame of rebalance dates with turnover and cost).
+    """
+    if frequency not in REBALANCE_FREQUENCIES:
+        raise ValueError(f"Unknown rebalancing frequency '{frequency}'. Choose from {', '.join(REBALANCE_FREQUENCIES)}.")
+    prices = price_matrix.prices[:, price_matrix.positions(allocations)].astype(float)
+    weights = np.fromiter(allocations.values(), dtype=float, count=len(allocations))
+
+    if frequency == "threshold":
+        starts = [0]
+        while True:
+            breach = _first_drift_breach(prices[starts[-1]:], weights, threshold)
+            if breach is None:
+                break
+            starts.append(starts[-1] + breach)
+        starts = np.array(starts)
+    elif frequency == "none":
+        starts = np.array([0])
+    else:
+        starts = np.concatenate([[0], rebalance_dates(price_matrix.dates, frequency)])
+
+    # Growth of each day relative to the start of its holding period.
+    period = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(prices))))
+    relative = prices / prices[starts[period]]
+    growth = relative @ weights
+
+    # Rebalances trade at the close: weights have drifted over the period that ends
+    # there, and resetting them costs a fraction of the traded value.
+    ends = starts[1:]
+    end_relative = prices[ends] / prices[starts[:-1]]
+    end_growth = end_relative @ weights
+    drifted = weights * end_relative / end_growth[:, None]
+    turnover = np.abs(drifted - weights).sum(axis=1)
+    cost = transaction_cost * turnover
+
+    # Value carried into each period: previous period's growth, less the rebalancing cost.
+    carried = initial_investment * np.cumprod(np.concatenate([[1.0], end_growth * (1 - cost)]))
+    portfolio_value = carried[period] * growth
+
+    rebalances = pd.DataFrame({
+        "Date": price_matrix.dates[ends],
+        "Turnover": turnover,
+        "Cost": carried[:-1] * end_growth * cost,
+    })
+    return pd.Series(portfolio_value, index=price_matrix.dates), rebalances
+
+def calculate_returns(values):
+    values = np.asarray(values, dtype=float)
+    return values[1:] / values[:-1] - 1
+
+# --- Risk/Return Calculations ---
+def calculate_beta(portfolio_returns, benchmark_returns):
+    portfolio_returns = np.array(portfolio_returns).flatten()  
+    benchmark_returns = np.array(benchmark_returns).flatten()  
+
+    if portfolio_returns.shape != benchmark_returns.shape:
+        raise ValueError("Mismatched data shapes. Check alignment before computing beta.")
+
+    covariance = np.cov(portfolio_returns, benchmark_returns)[0, 1]
+    benchmark_variance = np.var(benchmark_returns)
+    beta = covariance / benchmark_variance
+    return beta
+
+def calculate_treynor_ratio(portfolio_return, risk_free_rate, beta):
+    return (portfolio_return - risk_free_rate) / beta
+
+def calculate_risk_return_metrics(daily_returns, benchmark_returns, risk_free_rate=0.02, periods_per_year=252):
+    # Both return arrays come from the same PriceMatrix, so they already share a calendar;
+    # only days where either side is missing need to be skipped. Pass `periods_per_year`
+    # for bars other than daily (e.g. utils.intraday.periods_per_year("5min")).
+    valid = np.isfinite(daily_returns) & np.isfinite(benchmark_returns)
+    daily_returns = daily_returns[valid]
+    benchmark_returns = benchmark_returns[valid]
+
+    if len(daily_returns) == 0 or len(benchmark_returns) == 0:
+        raise ValueError("Insufficient overlapping data between portfolio and benchmark.")
+
+    annual_return = daily_returns.mean() * periods_per_year
+    annual_volatility = daily_returns.std(ddof=1) * (periods_per_year ** 0.5)
+    sharpe_ratio = (annual_return - risk_free_rate) / annual_volatility
+
+    beta = calculate_beta(daily_returns, benchmark_returns)
+    treynor_ratio = calculate_treynor_ratio(annual_return, risk_free_rate, beta)
+
+    return annual_return, annual_volatility, sharpe_ratio, beta, treynor_ratio
+
+
+# --- Additional Metrics ---
+def calculate_moving_average(stock_data, window=50):
+    return stock_data.rolling(window=window).mean()
+
+def calculate_rsi(stock_data, period=14):
+    delta = stock_data.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+def create_buy_sell_signals(stock_data):
+    # Moving Average strategy for buy/sell recommendation
+    ma50 = calculate_moving_average(stock_data, window=50)
+    ma200 = calculate_moving_average(stock_data, window=200)
+    rsi = calculate_rsi(stock_data)
+
+    # Generate buy/sell signals
+    signals = pd.DataFrame(index=stock_data.index)
+    signals['Signal'] = np.where(ma50 > ma200, 'Buy', 'Sell')
+    signals['RSI'] = rsi
+    signals['RSI Signal'] = np.where(rsi < 30, 'Buy', np.where(rsi > 70, 'Sell', 'Hold'))
+
+    return signals, ma50, ma200, rsi
+
+# --- Report Generation ---
+def create_excel_report(portfolio_data, metrics):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        portfolio_data.to_excel(writer, sheet_name="Portfolio Data", index=False)
+        metrics.to_excel(writer, sheet_name="Performance Metrics", index=False)
+    
+    output.seek(0)
+    return output
+
+def create_pdf_report(portfolio_data, metrics):
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+
+    pdf.set_font("Arial", 'B', 16)
+    pdf.cell(200, 10, txt="Portfolio Performance Report", ln=True, align="C")
+    pdf.ln(10)
+
+    pdf.set_font("Arial", size=12)
+    pdf.cell(200, 10, txt="Portfolio Data:", ln=True)
+    pdf.ln(5)
+
+    for col in portfolio_data.columns:
+        pdf.cell(40, 10, txt=col, border=1, align="C")
+    pdf.ln()
+
+    for i in range(len(portfolio_data)):
+        for col in portfolio_data.columns:
+            pdf.cell(40, 10, txt=str(portfolio_data[col].iloc[i]), border=1, align="C")
+        pdf.ln()
+
+    pdf.ln(10)
+    pdf.cell(200, 10, txt="Performance Metrics:", ln=True)
+    pdf.ln(5)
+
+    for metric, value in metrics.items():
+        pdf.cell(200, 10, txt=f"{metric}: {value}", ln=True)
+
+    pdf_output = pdf.output(dest='S')  
+    pdf_output = BytesIO(pdf_output.encode('latin1')) 
+    pdf_output.seek(0) 
+    return pdf_output
+
+def comparison_indicator(portfolio_value, benchmark_value):
+    if isinstance(portfolio_value, pd.Series):
+        portfolio_value = portfolio_value.iloc[-1] 
+    if isinstance(benchmark_value, pd.Series):
+        benchmark_value = benchmark_value.iloc[-1]  
+
+    return "📈" if portfolio_value > benchmark_value else "📉"
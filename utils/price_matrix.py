@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+
+class PriceMatrix:
+    """Stock and benchmark prices aligned on one shared trading calendar.
+
+    Prices are held as a single column-major NumPy array (dates x tickers), so
+    `column` and `series` hand out zero-copy views of one ticker. Returns are
+    computed once on first access and reused by every metric, signal and chart
+    built from the same matrix.
+    """
+
+    def __init__(self, dates, tickers, prices, benchmark=None):
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = list(tickers)
+        self.prices = np.asfortranarray(prices)
+        self.benchmark = benchmark
+        self._positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._returns = None
+        self._benchmark_returns = None
+
+    @classmethod
+    def from_frames(cls, stock_data, benchmark_data=None, dtype=np.float64):
+        """Builds a matrix from a Close DataFrame and an optional benchmark Series/DataFrame.
+
+        Only dates present in both calendars are kept. Pass `dtype=np.float32` to halve
+        memory for large universes.
+        """
+        if isinstance(stock_data, pd.Series):
+            stock_data = stock_data.to_frame()
+        dates = stock_data.index
+        benchmark = None
+        if benchmark_data is not None:
+            if isinstance(benchmark_data, pd.DataFrame):
+                benchmark_data = benchmark_data.iloc[:, 0]
+            dates = dates.intersection(benchmark_data.index)
+            benchmark = benchmark_data.reindex(dates).to_numpy(dtype=dtype)
+        prices = stock_data.reindex(dates).to_numpy(dtype=dtype)
+        return cls(dates, stock_data.columns, prices, benchmark)
+
+    # --- Shape ---
+    def __len__(self):
+        return len(self.dates)
+
+    def __contains__(self, ticker):
+        return ticker in self._positions
+
+    @property
+    def shape(self):
+        return self.prices.shape
+
+    @property
+    def nbytes(self):
+        """Bytes held by the price arrays and any cached returns."""
+        arrays = [self.prices, self.benchmark, self._returns, self._benchmark_returns]
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    # --- Views ---
+    def column(self, ticker):
+        """Returns the prices of `ticker` as a zero-copy NumPy view."""
+        return self.prices[:, self._positions[ticker]]
+
+    def series(self, ticker):
+        """Returns the prices of `ticker` as a pandas Series backed by the matrix."""
+        return pd.Series(self.column(ticker), index=self.dates, name=ticker, copy=False)
+
+    def benchmark_series(self, name="S&P 500"):
+        return pd.Series(self.benchmark, index=self.dates, name=name, copy=False)
+
+    def positions(self, tickers):
+        return [self._positions[ticker] for ticker in tickers]
+
+    def select(self, tickers=None, start_date=None, end_date=None):
+        """Returns a matrix restricted to `tickers` and [start_date, end_date).
+
+        The date window is a view of the original arrays; picking a subset of
+        tickers copies only those columns.
+        """
+        start = 0 if start_date is None else self.dates.searchsorted(pd.Timestamp(start_date))
+        stop = len(self.dates) if end_date is None else self.dates.searchsorted(pd.Timestamp(end_date))
+        prices = self.prices[start:stop]
+        if tickers is not None:
+            prices = prices[:, self.positions(tickers)]
+        else:
+            tickers = self.tickers
+        benchmark = None if self.benchmark is None else self.benchmark[start:stop]
+        return PriceMatrix(self.dates[start:stop], tickers, prices, benchmark)
+
+    def dropna(self):
+        """Returns a matrix without the dates where any price (or the benchmark) is missing."""
+        valid = np.isfinite(self.prices).all(axis=1)
+        if self.benchmark is not None:
+            valid &= np.isfinite(self.benchmark)
+        if valid.all():
+            return self
+        benchmark = None if self.benchmark is None else self.benchmark[valid]
+        return PriceMatrix(self.dates[valid], self.tickers, self.prices[valid], benchmark)
+
+    def to_frame(self):
+        return pd.DataFrame(self.prices, index=self.dates, columns=self.tickers)
+
+    # --- Returns ---
+    @property
+    def returns(self):
+        """Simple daily returns (dates[1:] x tickers), computed once."""
+        if self._returns is None:
+            self._returns = self.prices[1:] / self.prices[:-1] - 1
+        return self._returns
+
+    @property
+    def benchmark_returns(self):
+        """Simple daily benchmark returns aligned with `returns`, computed once."""
+        if self._benchmark_returns is None and self.benchmark is not None:
+            self._benchmark_returns = self.benchmark[1:] / self.benchmark[:-1] - 1
+        return self._benchmark_returns
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from utils.price_matrix import PriceMatrix
+
+SP500_TICKERS_PATH = "models/sp500_tickers.csv"
+CHUNK_SIZE = 50
+DEFAULT_LOOKBACK_YEARS = 2
+
+
+# --- Universe ---
+
+def load_universe(path=SP500_TICKERS_PATH):
+    """Returns the ticker symbols listed in the `ticker` column of a local CSV."""
+    return pd.read_csv(path)['ticker'].dropna().str.strip().tolist()
+
+def default_date_range():
+    """The screener page's default (start, end) dates: the trailing DEFAULT_LOOKBACK_YEARS."""
+    end_date = pd.Timestamp.today().normalize()
+    return end_date - pd.DateOffset(years=DEFAULT_LOOKBACK_YEARS), end_date
+
+def fetch_universe_prices(tickers, start_date, end_date, loader, chunk_size=CHUNK_SIZE, progress=None):
+    """Loads Close prices for a large universe in chunks through `loader(tickers, start, end)`.
+
+    Chunks are the unit of caching, so rerunning a screen over the same universe and
+    dates is served from the loader's cache. `progress(done, total)` is called after
+    every chunk.
+    """
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    frames = []
+    for i, chunk in enumerate(chunks):
+        frame = loader(chunk, start_date, end_date)
+        if not frame.empty:
+            frames.append(frame)
+        if progress is not None:
+            progress(i + 1, len(chunks))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=1).sort_index()
+
+
+# --- Vectorized Indicators ---
+
+def _trailing_mean(prices, window):
+    # Mean of the last `window` rows per column; NaN when the window is incomplete,
+    # which matches rolling(window).mean().iloc[-1].
+    if len(prices) < window:
+        return np.full(prices.shape[1], np.nan)
+    return prices[-window:].mean(axis=0)
+
+def screen_signals(price_matrix, short_window=50, long_window=200, rsi_period=14,
+                   rsi_oversold=30, rsi_overbought=70):
+    """Computes the latest MA-crossover and RSI signals for every ticker at once.
+
+    Uses the same rules as create_buy_sell_signals, evaluated only on the last day
+    across the whole (dates x tickers) matrix. Returns one row per ticker ranked
+    by a composite strength score: the z-scored MA spread plus the z-scored RSI
+    distance below 50, so strong uptrends that are not overbought rank first.
+    """
+    prices = price_matrix.prices
+    ma_short = _trailing_mean(prices, short_window)
+    ma_long = _trailing_mean(prices, long_window)
+
+    delta = np.diff(prices[-(rsi_period + 1):], axis=0)
+    gain = np.where(delta > 0, delta, 0).mean(axis=0)
+    loss = np.where(delta < 0, -delta, 0).mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + gain / loss))
+        ma_spread = ma_short / ma_long - 1
+
+    results = pd.DataFrame({
+        "Ticker": price_matrix.tickers,
+        "Last Price": prices[-1],
+        f"MA{short_window}": ma_short,
+        f"MA{long_window}": ma_long,
+        "MA Spread": ma_spread,
+        "Signal": np.where(ma_short > ma_long, "Buy", "Sell"),
+        "RSI": rsi,
+        "RSI Signal": np.where(rsi < rsi_oversold, "Buy", np.where(rsi > rsi_overbought, "Sell", "Hold")),
+    })
+
+    def zscore(values):
+        return (values - np.nanmean(values)) / np.nanstd(values)
+
+    results["Strength"] = zscore(ma_spread) + zscore(50 - rsi)
+    results = results.dropna(subset=["MA Spread", "RSI"])
+    return results.sort_values("Strength", ascending=False).reset_index(drop=True)
+
+def run_screen(tickers, start_date, end_date, loader, progress=None, **signal_params):
+    """Fetches the universe in chunks and returns the ranked signal table."""
+    stock_data = fetch_universe_prices(tickers, start_date, end_date, loader, progress=progress)
+    if stock_data.empty:
+        return pd.DataFrame()
+    return screen_signals(PriceMatrix.from_frames(stock_data), **signal_params)
@@ -0,0 +1,28 @@
+class StageCache:
+    """Memoizes the stages of a page's analysis in session state, keyed by their inputs.
+
+    Each stage keeps only its latest result. A stage's key should include the keys
+    of the stages it depends on, so changing an input recomputes exactly the stages
+    downstream of it and every other stage is served from the session.
+    """
+
+    def __init__(self, state, namespace):
+        if namespace not in state:
+            state[namespace] = {}
+        self._entries = state[namespace]
+
+    def stage(self, name, key, compute):
+        """Returns the stored result of `name` if it was computed for `key`, else `compute()`.
+
+        A result of None (e.g. a failed download) is not stored, so it is retried on
+        the next rerun.
+        """
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        value = compute()
+        if value is None:
+            self._entries.pop(name, None)
+        else:
+            self._entries[name] = (key, value)
+        return value
@@ -0,0 +1,112 @@
+"""Monte Carlo simulation of a portfolio's forward value, with VaR/CVaR.
+
+Paths are simulated in chunks sized to a memory budget, so 100k paths x 252 days
+never materialize at once. Every chunk keeps only its terminal values (for exact
+VaR/CVaR) and a per-day histogram of log-values (for the percentile fan chart).
+Chunks get independent seeds spawned from one SeedSequence, so for a given seed
+and memory budget the results do not depend on how many worker processes share
+the work.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+METHODS = ["bootstrap", "parametric"]
+FAN_BINS = 2048
+
+
+# --- Historical Risk ---
+
+def historical_var_cvar(daily_returns, initial_value, confidence_levels=(0.95, 0.99)):
+    """One-day VaR/CVaR in currency from the empirical distribution of daily returns."""
+    daily_returns = np.asarray(daily_returns, dtype=float)
+    losses = -daily_returns[np.isfinite(daily_returns)] * initial_value
+    rows = []
+    for confidence in confidence_levels:
+        var = np.quantile(losses, confidence)
+        rows.append({"Confidence": confidence, "VaR": var, "CVaR": losses[losses >= var].mean()})
+    return pd.DataFrame(rows)
+
+
+# --- Path Simulation ---
+
+def _simulate_chunk(task):
+    log_returns, method, n_paths, horizon, seed, bin_edges = task
+    rng = np.random.default_rng(seed)
+    if method == "bootstrap":
+        paths = rng.choice(log_returns, size=(n_paths, horizon))
+    else:
+        paths = rng.normal(log_returns.mean(), log_returns.std(ddof=1), size=(n_paths, horizon))
+    np.cumsum(paths, axis=1, out=paths)
+
+    # Histogram of cumulative log-returns per day: (horizon x bins) counts.
+    bins = np.clip(np.searchsorted(bin_edges, paths, side="right") - 1, 0, len(bin_edges) - 2)
+    bins += np.arange(horizon) * (len(bin_edges) - 1)
+    counts = np.bincount(bins.ravel(), minlength=horizon * (len(bin_edges) - 1))
+    return paths[:, -1].copy(), counts.reshape(horizon, -1)
+
+def _fan_percentiles(counts, bin_edges, percentiles):
+    # Interpolated percentiles from the per-day histograms.
+    cumulative = np.cumsum(counts, axis=1) / counts.sum(axis=1, keepdims=True)
+    centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+    return np.array([[np.interp(p / 100, day, centers) for p in percentiles] for day in cumulative])
+
+def simulate_portfolio(daily_returns, initial_value, horizon=252, n_paths=100000, method="bootstrap",
+                       seed=0, confidence_levels=(0.95, 0.99), percentiles=(5, 25, 50, 75, 95),
+                       memory_budget_mb=64, workers=1):
+    """Simulates `n_paths` forward paths of the portfolio value over `horizon` trading days.
+
+    "bootstrap" resamples the historical daily returns; "parametric" draws normal
+    log-returns with their historical mean and volatility. Returns
+    (fan DataFrame of value percentiles per day, risk DataFrame of horizon VaR/CVaR
+    in currency, array of terminal values).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown simulation method '{method}'. Choose from {', '.join(METHODS)}.")
+    daily_returns = np.asarray(daily_returns, dtype=float)
+    log_returns = np.log1p(daily_returns[np.isfinite(daily_returns)])
+    if len(log_returns) < 2:
+        raise ValueError("Not enough return history to simulate.")
+
+    # Histogram range: generous multiple of the horizon's volatility around its drift.
+    spread = 8 * log_returns.std(ddof=1) * np.sqrt(horizon) + abs(log_returns.mean()) * horizon
+    bin_edges = np.linspace(-spread, spread, FAN_BINS + 1)
+
+    # A chunk holds up to four (paths x horizon) 8-byte arrays at peak: the draws,
+    # their resampling indices or cumulative sums, and the histogram bin indices.
+    chunk_paths = max(1, int(memory_budget_mb * 2**20 // (horizon * 8 * 4)))
+    chunk_sizes = [min(chunk_paths, n_paths - start) for start in range(0, n_paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [(log_returns, method, size, horizon, chunk_seed, bin_edges) for size, chunk_seed in zip(chunk_sizes, seeds)]
+
+    terminal_log_returns = []
+    counts = np.zeros((horizon, FAN_BINS), dtype=np.int64)
+
+    def accumulate(chunks):
+        # Fold chunks in as they arrive so at most one chunk's results are held at a time.
+        nonlocal counts
+        for chunk_terminal, chunk_counts in chunks:
+            terminal_log_returns.append(chunk_terminal)
+            counts += chunk_counts
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        accumulate(map(_simulate_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            accumulate(executor.map(_simulate_chunk, tasks))
+
+    terminal_values = initial_value * np.exp(np.concatenate(terminal_log_returns))
+    losses = initial_value - terminal_values
+    rows = []
+    for confidence in confidence_levels:
+        var = np.quantile(losses, confidence)
+        rows.append({"Confidence": confidence, "VaR": var, "CVaR": losses[losses >= var].mean()})
+
+    fan = initial_value * np.exp(_fan_percentiles(counts, bin_edges, percentiles))
+    fan = np.vstack([np.full(len(percentiles), float(initial_value)), fan])
+    fan = pd.DataFrame(fan, columns=[f"P{p}" for p in percentiles])
+    fan.index.name = "Trading Day"
+    return fan, pd.DataFrame(rows), terminal_values
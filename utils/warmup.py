@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+
+import streamlit as st
+
+from utils.assets import build_all_variants
+from utils.loaders import load_stock_data, load_benchmark_data, load_housing_model, load_otodom_data
+from utils.market_data import PREDEFINED_STOCKS, DEFAULT_TICKERS, DEFAULT_START_DATE, DEFAULT_END_DATE
+from utils.screener import default_date_range, fetch_universe_prices, load_universe
+
+# Minutes between refreshes of the screener's default prices; 0 disables the schedule.
+REFRESH_MINUTES = float(os.getenv("WARMUP_REFRESH_MINUTES", "0"))
+
+
+class Warmup:
+    """Background thread that fills the shared caches in utils.loaders.
+
+    It is started by the first script run after the server starts (Streamlit has no
+    earlier hook), so only that first session can see it still running.
+
+    Each task records its state ("pending", "running", "done" or "failed"), duration
+    and error, so pages can report progress without waiting on the thread.
+    """
+
+    def __init__(self, refresh_minutes=0):
+        self.refresh_minutes = refresh_minutes
+        self._lock = threading.Lock()
+        self._status = {}
+        self._thread = threading.Thread(target=self._run, name="cache-warmup", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _tasks(self):
+        return [
+            ("Default portfolio prices", lambda: load_stock_data(DEFAULT_TICKERS, DEFAULT_START_DATE, DEFAULT_END_DATE)),
+            ("Default benchmark prices", lambda: load_benchmark_data(DEFAULT_START_DATE, DEFAULT_END_DATE)),
+            ("Housing model", load_housing_model),
+            ("Otodom listings", load_otodom_data),
+            ("Image variants", build_all_variants),
+        ]
+
+    def _refresh_tasks(self):
+        # The exact cache keys the screener page requests with its default dates:
+        # the same chunks of tickers over the trailing window, refetched on every pass.
+        start_date, end_date = (date.strftime('%Y-%m-%d') for date in default_date_range())
+
+        def refresh(chunk, start_date, end_date):
+            return load_stock_data(chunk, start_date, end_date, refresh=True)
+
+        return [
+            ("Screener: predefined stocks", lambda: fetch_universe_prices(PREDEFINED_STOCKS, start_date, end_date, refresh)),
+            ("Screener: S&P 500", lambda: fetch_universe_prices(load_universe(), start_date, end_date, refresh)),
+        ]
+
+    def _run(self):
+        tasks = self._tasks()
+        if self.refresh_minutes > 0:
+            tasks += self._refresh_tasks()
+        for name, _ in tasks:
+            self._set(name, state="pending")
+        self._run_tasks(tasks)
+
+        while self.refresh_minutes > 0:
+            time.sleep(self.refresh_minutes * 60)
+            self._run_tasks(self._refresh_tasks())
+
+    def _run_tasks(self, tasks):
+        for name, task in tasks:
+            self._set(name, state="running", error=None)
+            started = time.perf_counter()
+            try:
+                task()
+                self._set(name, state="done", seconds=time.perf_counter() - started, finished_at=time.time())
+            except Exception as e:
+                print(f"Warm-up task '{name}' failed: {e}")
+                self._set(name, state="failed", seconds=time.perf_counter() - started, error=str(e))
+
+    def _set(self, name, **fields):
+        with self._lock:
+            self._status.setdefault(name, {}).update(fields)
+
+    def status(self):
+        """Returns a copy of the per-task status dictionary."""
+        with self._lock:
+            return {name: dict(fields) for name, fields in self._status.items()}
+
+    @property
+    def ready(self):
+        """True once every task has completed (or failed) at least once."""
+        status = self.status()
+        return bool(status) and all("finished_at" in fields or fields["state"] == "failed" for fields in status.values())
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup():
+    """Starts the warm-up thread once per server process and returns it."""
+    return Warmup(refresh_minutes=REFRESH_MINUTES).start()